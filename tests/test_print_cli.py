@@ -0,0 +1,168 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+import tomli
+from rich.prompt import Confirm
+
+import wake.cli.print as print_cli
+from wake.cli.print import PrintCli, _iter_sol_files, run_print
+from wake.utils.file_utils import is_relative_to
+
+PRINTER_SOURCE = """
+import rich_click as click
+from wake.printers import Printer, printer
+
+
+class TestPrinter(Printer):
+    def print(self) -> None:
+        pass
+
+    @printer.command(name="{name}")
+    def cli(self) -> None:
+        pass
+"""
+
+
+@pytest.fixture
+def plugin_cli(tmp_path: Path, monkeypatch):
+    # isolate the global printer group from installed plugins and user configuration
+    monkeypatch.setattr(print_cli, "_printer_entry_points", lambda: ())
+    monkeypatch.setattr(run_print, "_global_data_path", tmp_path / "data")
+    monkeypatch.setattr(run_print, "_plugins_config_path", tmp_path / "plugins.toml")
+    monkeypatch.setattr(run_print, "commands", dict(run_print.commands))
+    for attr in [
+        "loaded_from_plugins",
+        "printer_sources",
+        "_plugin_modules",
+        "_failed_plugin_paths",
+        "_failed_plugin_entry_points",
+    ]:
+        monkeypatch.setattr(run_print, attr, {})
+    monkeypatch.setattr(run_print, "_printer_collisions", set())
+    monkeypatch.setattr(sys, "path", list(sys.path))
+
+    modules_before = set(sys.modules)
+    yield run_print
+    for m in sys.modules.keys() - modules_before:
+        del sys.modules[m]
+
+
+def test_non_importable_plugin_paths_reported(tmp_path: Path, plugin_cli):
+    plugin = tmp_path / "_private_printer.py"
+    plugin.write_text(PRINTER_SOURCE.format(name="test-private-printer"))
+    not_a_package = tmp_path / "not_a_package"
+    not_a_package.mkdir()
+    (not_a_package / "printer.py").write_text(
+        PRINTER_SOURCE.format(name="test-not-loaded")
+    )
+    not_a_module = tmp_path / "printer.txt"
+    not_a_module.write_text("")
+
+    plugin_cli._load_plugins(
+        {plugin, not_a_package, not_a_module, tmp_path / "missing"},
+        verify_paths=False,
+    )
+
+    assert plugin_cli.loaded_from_plugins == {"test-private-printer": plugin}
+    assert set(plugin_cli.failed_plugin_paths) == {not_a_package, not_a_module}
+    assert all(
+        isinstance(e, ImportError) for e in plugin_cli.failed_plugin_paths.values()
+    )
+    assert "test-not-loaded" not in plugin_cli.commands
+
+
+def test_plugin_reload_unloads_lazy_submodules(tmp_path: Path, plugin_cli):
+    package = tmp_path / "wake_test_plugin"
+    package.mkdir()
+    (package / "__init__.py").write_text(
+        PRINTER_SOURCE.format(name="test-reloaded-printer")
+    )
+    (package / "lazy.py").write_text("")
+    unrelated = tmp_path / "wake_test_plugin_bar.py"
+    unrelated.write_text("")
+
+    plugin_cli._load_plugins({package}, verify_paths=False)
+    # imported after loading, e.g. lazily from a printer callback
+    import wake_test_plugin.lazy  # pyright: ignore reportMissingImports
+    import wake_test_plugin_bar  # pyright: ignore reportMissingImports
+
+    plugin_cli._load_plugins({package}, verify_paths=False)
+
+    assert "wake_test_plugin" not in sys.modules
+    assert "wake_test_plugin.lazy" not in sys.modules
+    assert sys.modules["wake_test_plugin_bar"] is wake_test_plugin_bar
+    assert plugin_cli.loaded_from_plugins == {"test-reloaded-printer": package}
+    assert plugin_cli.failed_plugin_paths == {}
+
+
+def test_verified_paths_from_two_writers(tmp_path: Path, monkeypatch):
+    config_path = tmp_path / "plugins.toml"
+    config_path.write_text('[printer_loading_priorities]\n"*" = "wake_printers"\n')
+    first_path = (tmp_path / "first").resolve()
+    second_path = (tmp_path / "second").resolve()
+    monkeypatch.setattr(Confirm, "ask", lambda *args, **kwargs: True)
+
+    writers = [PrintCli(), PrintCli()]
+    for writer in writers:
+        monkeypatch.setattr(writer, "_plugins_config_path", config_path)
+        # both load the verified paths before either of them writes
+        writer._load_verified()
+
+    assert writers[0]._verify_plugin_path(first_path)
+    assert writers[1]._verify_plugin_path(second_path)
+
+    config = tomli.loads(config_path.read_text())
+    assert config["verified_paths"] == sorted([str(first_path), str(second_path)])
+    assert config["printer_loading_priorities"] == {"*": "wake_printers"}
+    assert writers[1]._verified_paths == {first_path, second_path}
+
+
+def test_iter_sol_files_matches_rglob(tmp_path: Path, monkeypatch):
+    root = tmp_path / "project"
+    for file in [
+        "a.sol",
+        "a.sol.bak",
+        "b.txt",
+        "contracts/c.sol",
+        "contracts/nested/d.sol",
+        "dir.sol/e.sol",
+        "node_modules/lib/f.sol",
+        "lib/forge-std/g.sol",
+        "lib/forge-std-extra/h.sol",
+        "outside/i.sol",
+    ]:
+        (root / file).parent.mkdir(parents=True, exist_ok=True)
+        (root / file).write_text("")
+    (root / "outside").rename(tmp_path / "outside")
+    (root / "linked.sol").symlink_to(root / "contracts" / "c.sol")
+    (root / "linked_dir").symlink_to(tmp_path / "outside", target_is_directory=True)
+    (root / "linked_dir.sol").symlink_to(root / "contracts", target_is_directory=True)
+    (root / "broken.sol").symlink_to(root / "missing.sol")
+
+    exclude_paths = {root / "node_modules", root / "lib" / "forge-std"}
+    expected = {
+        file
+        for file in root.rglob("**/*.sol")
+        if not any(is_relative_to(file, p) for p in exclude_paths) and file.is_file()
+    }
+
+    scanned = []
+    scandir = os.scandir
+
+    def recording_scandir(path):
+        scanned.append(Path(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+    assert set(_iter_sol_files(root, exclude_paths)) == expected
+    assert root / "lib" / "forge-std-extra" / "h.sol" in expected
+    # excluded directories are pruned, symlinked directories are not followed
+    assert not any(
+        is_relative_to(p, excluded)
+        for p in scanned
+        for excluded in exclude_paths | {root / "linked_dir"}
+    )
+
+    assert list(_iter_sol_files(root, {root})) == []
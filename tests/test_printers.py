@@ -0,0 +1,94 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import networkx as nx
+import pytest
+import rich_click as click
+
+from wake.cli.print import run_print
+from wake.config import WakeConfig
+from wake.printers import Printer
+from wake.printers.api import run_printers
+
+received_graphs = {}
+
+
+class ReadingPrinter(Printer):
+    mutates_graph = False
+
+    def print(self) -> None:
+        received_graphs["reading"] = self.imports_graph
+
+    @click.command(name="test-reading")
+    def cli(self) -> None:
+        pass
+
+
+class MutatingPrinter(Printer):
+    def print(self) -> None:
+        self.imports_graph.add_node("added.sol")
+        received_graphs["mutating"] = self.imports_graph
+
+    @click.command(name="test-mutating")
+    def cli(self) -> None:
+        pass
+
+
+class FailingPrinter(Printer):
+    mutates_graph = False
+
+    def print(self) -> None:
+        pass
+
+    @click.command(name="test-failing", deprecated=True)
+    def cli(self) -> None:
+        raise click.BadParameter("invalid value")
+
+
+def _run_printers(names, graph: nx.DiGraph, tmp_path: Path, monkeypatch):
+    commands = {
+        "test-reading": ReadingPrinter.cli,
+        "test-mutating": MutatingPrinter.cli,
+        "test-failing": FailingPrinter.cli,
+    }
+    monkeypatch.setattr(
+        run_print, "get_command", lambda ctx, name, **kwargs: commands[name]
+    )
+
+    return run_printers(
+        names,
+        SimpleNamespace(source_units={}),  # pyright: ignore reportGeneralTypeIssues
+        None,  # pyright: ignore reportGeneralTypeIssues
+        graph,
+        WakeConfig(project_root_path=tmp_path),
+        None,  # pyright: ignore reportGeneralTypeIssues
+        None,
+        None,
+        paths=[],
+    )
+
+
+def test_imports_graph_shared_unless_mutated(tmp_path: Path, monkeypatch):
+    graph = nx.DiGraph()
+    graph.add_edge("a.sol", "b.sol")
+
+    received_graphs.clear()
+    _, exceptions = _run_printers(
+        ["test-reading", "test-mutating"], graph, tmp_path, monkeypatch
+    )
+
+    assert exceptions == {}
+    assert received_graphs["reading"] is graph
+    assert received_graphs["mutating"] is not graph
+    assert "added.sol" in received_graphs["mutating"]
+    assert "added.sol" not in graph
+
+
+def test_printer_usage_errors_and_deprecation(tmp_path: Path, monkeypatch, capsys):
+    with pytest.raises(click.BadParameter) as e:
+        _run_printers(["test-failing"], nx.DiGraph(), tmp_path, monkeypatch)
+
+    # click attaches the printer context to usage errors raised in the callback
+    assert e.value.ctx is not None
+    assert e.value.ctx.command is FailingPrinter.cli
+    assert "'test-failing' is deprecated" in capsys.readouterr().err
@@ -0,0 +1,604 @@
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+import pytest
+from eth_utils import event_signature_to_log_topic, function_signature_to_4byte_selector
+
+from wake.config import WakeConfig
+from wake.development.pytypes_generator import (
+    NameSanitizer,
+    TypeGenerator,
+    _abi_selector,
+    _library_function_selector,
+    _parse_opcodes,
+    _parse_source_map,
+    _signature_hash,
+)
+from wake.ir import (
+    ContractDefinition,
+    EnumDefinition,
+    EnumValue,
+    ErrorDefinition,
+    EventDefinition,
+    FunctionDefinition,
+    InheritanceSpecifier,
+    ModifierDefinition,
+    ParameterList,
+    SourceUnit,
+    StructDefinition,
+    VariableDeclaration,
+)
+from wake.ir.enums import ContractKind
+
+
+def _reference_parse_opcodes(
+    opcodes: str,
+) -> List[Tuple[int, str, int, Optional[int]]]:
+    pc_op_map = []
+    opcodes_spl = opcodes.split(" ")
+
+    pc = 0
+    ignore = False
+
+    for i, opcode in enumerate(opcodes_spl):
+        if ignore:
+            ignore = False
+            continue
+
+        if not opcode.startswith("PUSH") or opcode == "PUSH0":
+            pc_op_map.append((pc, opcode, 1, None))
+            pc += 1
+        else:
+            size = int(opcode[4:]) + 1
+            pc_op_map.append((pc, opcode, size, int(opcodes_spl[i + 1], 16)))
+            pc += size
+            ignore = True
+    return pc_op_map
+
+
+def _reference_parse_source_map(
+    source_map: str,
+    pc_op_map: List[Tuple[int, str, int, Optional[int]]],
+) -> Dict[int, Tuple[int, int, int, Optional[str]]]:
+    pc_map = {}
+    last_data = [-1, -1, -1, None, None]
+
+    for i, sm_item in enumerate(source_map.split(";")):
+        pc, op, size, argument = pc_op_map[i]
+        source_spl = sm_item.split(":")
+        for x in range(len(source_spl)):
+            if source_spl[x] == "":
+                continue
+            if x < 3:
+                last_data[x] = int(source_spl[x])
+            else:
+                last_data[x] = source_spl[x]
+
+        pc_map[pc] = (
+            last_data[0],
+            last_data[0] + last_data[1],
+            last_data[2],
+            last_data[3],
+        )
+
+    return pc_map
+
+
+def test_parse_opcodes():
+    test_cases = [
+        "PUSH1 0x80 PUSH1 0x40 MSTORE CALLVALUE DUP1 ISZERO PUSH2 0xF JUMPI PUSH0 DUP1 REVERT",
+        "PUSH0 PUSH0 RETURN",
+        "PUSH9 0x1 PUSH10 0xFF PUSH19 0xabc PUSH20 0x0 PUSH29 0x1 PUSH30 0x2 PUSH32 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF",
+        "STOP",
+        "INVALID LOG2 PUSH5 0x6970667358 0x22 SLT KECCAK256",
+    ]
+
+    for opcodes in test_cases:
+        assert _parse_opcodes(opcodes) == _reference_parse_opcodes(opcodes)
+        # solc output ends with a trailing space
+        assert _parse_opcodes(opcodes + " ") == _reference_parse_opcodes(opcodes)
+
+    assert _parse_opcodes("") == []
+    assert _parse_opcodes("PUSH0") == [(0, "PUSH0", 1, None)]
+
+
+def test_parse_opcodes_invalid_push_argument():
+    for opcodes in ["PUSH1 MSTORE", "PUSH2", "PUSH1 0x80 PUSH32 ", "PUSH4 0xZZ"]:
+        with pytest.raises(ValueError):
+            _parse_opcodes(opcodes)
+
+
+def test_parse_source_map():
+    pc_op_map = _parse_opcodes(
+        "PUSH1 0x80 PUSH1 0x40 MSTORE CALLVALUE DUP1 ISZERO PUSH2 0xF JUMPI PUSH0 DUP1 REVERT "
+        "JUMPDEST POP INVALID LOG2 PUSH5 0x6970667358 "
+    )
+    test_cases = [
+        # fields inherited from the previous item, empty items
+        "0:100:0:-:0;;;;8:9;;;;::1;;:;;;",
+        # 4-field and 5-field items, modifier depth changes only
+        "0:100:0:-;12:3:0:i;::1:o:2;:::-:1;5:6;7;;:::i;::::0;-1:-1:-1:-",
+        # jump type without other fields
+        ":::i;;:::o;:::-",
+        # fewer items than opcodes (trailing metadata is not mapped)
+        "1:2:0:-;;",
+        "1:2:0:-",
+        "",
+    ]
+
+    for source_map in test_cases:
+        source_map_items = _parse_source_map(source_map, pc_op_map)
+        assert len(source_map_items) == len(pc_op_map)
+
+        reference = _reference_parse_source_map(source_map, pc_op_map)
+        for (pc, _, _, _), item in zip(pc_op_map, source_map_items):
+            if pc in reference:
+                assert item == reference[pc]
+            else:
+                assert item == (-1, -1, -1, None)
+
+    assert _parse_source_map("", []) == []
+    with pytest.raises(ValueError):
+        _parse_source_map("0:1:0:-;;", _parse_opcodes("STOP STOP"))
+
+
+def test_abi_selectors():
+    transfer = {
+        "type": "function",
+        "name": "transfer",
+        "inputs": [
+            {"name": "to", "type": "address", "internalType": "address"},
+            {"name": "amount", "type": "uint256", "internalType": "uint256"},
+        ],
+    }
+    assert _abi_selector(transfer)[:4] == function_signature_to_4byte_selector(
+        "transfer(address,uint256)"
+    )
+
+    tuple_function = {
+        "type": "function",
+        "name": "submit",
+        "inputs": [
+            {
+                "name": "orders",
+                "type": "tuple[2][]",
+                "internalType": "struct Exchange.Order[2][]",
+                "components": [
+                    {"name": "maker", "type": "address", "internalType": "address"},
+                    {
+                        "name": "fee",
+                        "type": "tuple",
+                        "internalType": "struct Exchange.Fee",
+                        "components": [
+                            {"name": "bps", "type": "uint16", "internalType": "uint16"},
+                            {
+                                "name": "to",
+                                "type": "address[]",
+                                "internalType": "address[]",
+                            },
+                        ],
+                    },
+                ],
+            },
+            {"name": "data", "type": "bytes", "internalType": "bytes"},
+        ],
+    }
+    assert _abi_selector(tuple_function)[:4] == function_signature_to_4byte_selector(
+        "submit((address,(uint16,address[]))[2][],bytes)"
+    )
+
+    no_inputs = {"type": "function", "name": "totalSupply", "inputs": []}
+    assert _abi_selector(no_inputs)[:4] == function_signature_to_4byte_selector(
+        "totalSupply()"
+    )
+
+    error = {
+        "type": "error",
+        "name": "InsufficientBalance",
+        "inputs": [
+            {"name": "available", "type": "uint256", "internalType": "uint256"},
+            {"name": "required", "type": "uint256", "internalType": "uint256"},
+        ],
+    }
+    assert _abi_selector(error)[:4] == function_signature_to_4byte_selector(
+        "InsufficientBalance(uint256,uint256)"
+    )
+
+    event = {
+        "type": "event",
+        "name": "Transfer",
+        "anonymous": False,
+        "inputs": [
+            {"name": "from", "type": "address", "indexed": True},
+            {"name": "to", "type": "address", "indexed": True},
+            {"name": "value", "type": "uint256", "indexed": False},
+        ],
+    }
+    assert _abi_selector(event) == event_signature_to_log_topic(
+        "Transfer(address,address,uint256)"
+    )
+
+    library_function = {
+        "type": "function",
+        "name": "update",
+        "inputs": [
+            {"name": "s", "type": "tuple", "internalType": "struct Lib.S"},
+            {"name": "token", "type": "address", "internalType": "contract IERC20"},
+            {"name": "e", "type": "uint8", "internalType": "enum Lib.E"},
+            {"name": "a", "type": "uint256[]", "internalType": "uint256[]"},
+        ],
+    }
+    assert _library_function_selector(
+        library_function
+    ) == function_signature_to_4byte_selector("update(Lib.S,IERC20,Lib.E,uint256[])")
+
+    assert _signature_hash("") == event_signature_to_log_topic("")
+
+
+def test_generate_types_import_cycles(tmp_path: Path, monkeypatch):
+    # edge a -> b means that b imports a
+    graph = nx.DiGraph()
+    graph.add_nodes_from(f"{name}.sol" for name in "abcdefgh")
+    graph.add_edges_from(
+        [
+            # b and c import each other, b also imports a
+            ("a.sol", "b.sol"),
+            ("c.sol", "b.sol"),
+            ("b.sol", "c.sol"),
+            # acyclic tail importing the cycle
+            ("c.sol", "d.sol"),
+            ("d.sol", "e.sol"),
+            # g imports itself, h imports g
+            ("g.sol", "g.sol"),
+            ("g.sol", "h.sol"),
+        ]
+    )
+    source_units_to_paths = {name: tmp_path / "contracts" / name for name in graph}
+    compiler = SimpleNamespace(
+        latest_build=SimpleNamespace(
+            interval_trees={},
+            source_units={
+                path: SimpleNamespace(source_unit_name=name, contracts=[])
+                for name, path in source_units_to_paths.items()
+            },
+            reference_resolver=None,
+        ),
+        latest_graph=graph,
+        latest_source_units_to_paths=source_units_to_paths,
+    )
+
+    generator = TypeGenerator(WakeConfig(project_root_path=tmp_path), False)
+    order = []
+    monkeypatch.setattr(
+        generator,
+        "generate_types_source_unit",
+        lambda unit: order.append(unit.source_unit_name),
+    )
+    generator.generate_types(compiler)  # pyright: ignore reportGeneralTypeIssues
+
+    assert order == [
+        "a.sol",
+        "f.sol",
+        "b.sol",
+        "c.sol",
+        "g.sol",
+        "d.sol",
+        "e.sol",
+        "h.sol",
+    ]
+    # no source unit is skipped
+    assert {p.name for p in (tmp_path / "pytypes").glob("*.py")} == {
+        f"{name}.py" for name in "abcdefgh"
+    } | {"__init__.py"}
+    # the compiler graph is not modified
+    assert len(graph) == 8
+
+
+def _make_source_unit(
+    source_unit_name: str, contracts: List[Tuple[str, List[str]]]
+) -> SimpleNamespace:
+    unit = SimpleNamespace(
+        source_unit_name=source_unit_name,
+        structs=[],
+        enums=[],
+        errors=[],
+        events=[],
+        user_defined_value_types=[],
+        contracts=[],
+    )
+    definitions = {name: object.__new__(ContractDefinition) for name, _ in contracts}
+
+    for name, bases in contracts:
+        contract = definitions[name]
+        contract._name = name
+        contract._parent = lambda: unit
+        contract._kind = ContractKind.CONTRACT
+        contract._base_contracts = []
+        for base in bases:
+            inheritance_specifier = object.__new__(InheritanceSpecifier)
+            inheritance_specifier._base_name = SimpleNamespace(
+                referenced_declaration=definitions[base]
+            )
+            contract._base_contracts.append(inheritance_specifier)
+        for attr in ["enums", "structs", "errors", "events", "functions"]:
+            setattr(contract, f"_{attr}", [])
+        contract._declared_variables = []
+        contract._user_defined_value_types = [
+            SimpleNamespace(
+                name=f"{name}Value",
+                ast_node_id=len(unit.contracts),
+                underlying_type=SimpleNamespace(type_identifier="t_uint256"),
+            )
+        ]
+        unit.contracts.append(contract)
+    return unit
+
+
+def test_generate_types_contract_order(tmp_path: Path, monkeypatch):
+    # derived contracts are listed before their bases, so bases are generated from the derived contracts
+    unit = _make_source_unit(
+        "a.sol",
+        [
+            ("F", []),
+            ("E", ["C", "B"]),
+            ("D", ["B", "C"]),
+            ("C", ["A"]),
+            ("B", ["A"]),
+            ("A", []),
+        ],
+    )
+
+    generator = TypeGenerator(WakeConfig(project_root_path=tmp_path), False)
+    calls = []
+
+    def get_name(declaration, **kwargs):
+        calls.append(declaration.name)
+        return declaration.name
+
+    monkeypatch.setattr(generator, "get_name", get_name)
+    monkeypatch.setattr(
+        generator,
+        "generate_contract_template",
+        lambda contract, base_names: calls.append(
+            f"class {contract.name}({base_names})"
+        ),
+    )
+    generator.generate_types_source_unit(
+        unit
+    )  # pyright: ignore reportGeneralTypeIssues
+
+    # same order as the recursive generation, names are assigned in this order
+    assert calls == [
+        "F",
+        "class F(Contract)",
+        "B",
+        "A",
+        "A",
+        "class A(Contract)",
+        "B",
+        "class B(A)",
+        "C",
+        "A",
+        "C",
+        "class C(A)",
+        "E",
+        "class E(B, C)",
+        "C",
+        "B",
+        "D",
+        "class D(C, B)",
+    ]
+    # user defined value types are indexed in source order
+    assert list(
+        generator._TypeGenerator__user_defined_value_types_index  # pyright: ignore reportGeneralTypeIssues
+    ) == [f"t_userDefinedValueType({name}Value){i}" for i, name in enumerate("FEDCBA")]
+
+
+def _declaration(cls, name: str, parent, **attrs):
+    declaration = object.__new__(cls)
+    declaration._name = name
+    declaration._parent = lambda: parent
+    for attr, value in attrs.items():
+        setattr(declaration, f"_{attr}", value)
+    return declaration
+
+
+def _parameters(cls, names: List[str], parent) -> list:
+    owner = _declaration(cls, "owner", parent)
+    parameter_list = object.__new__(ParameterList)
+    parameter_list._parent = lambda: owner
+    return [_declaration(VariableDeclaration, name, parameter_list) for name in names]
+
+
+def test_name_sanitizer():
+    # expected names were produced by the previous implementation
+    unit = object.__new__(SourceUnit)
+    sanitizer = NameSanitizer()
+
+    def sanitize(declarations: list) -> List[str]:
+        names = [sanitizer.sanitize_name(d) for d in declarations]
+        # names are assigned only once
+        assert [sanitizer.sanitize_name(d) for d in declarations] == names
+        return names
+
+    global_declarations = [
+        _declaration(cls, name, unit)
+        for cls, name in [
+            (StructDefinition, "Contract"),
+            (ContractDefinition, "class"),
+            (EnumDefinition, "Foo"),
+            (StructDefinition, "Foo"),
+            (ErrorDefinition, "Foo_"),
+            (EventDefinition, "__init__"),
+            (StructDefinition, "$init__"),
+            (FunctionDefinition, "_init__"),
+            (FunctionDefinition, "uint256"),
+            (StructDefinition, "List7"),
+            (StructDefinition, "None"),
+        ]
+    ]
+    expected_global_names = [
+        "Contract_",
+        "class_",
+        "Foo",
+        "Foo_",
+        "Foo__",
+        "_init__",
+        "_init___",
+        "_init____",
+        "uint256_",
+        "List7_",
+        "None_",
+    ]
+    assert sanitize(global_declarations) == expected_global_names
+
+    contracts = {}
+    resolver = SimpleNamespace(resolve_node=lambda node_id, cu_hash: contracts[node_id])
+    for name, linearized_base_contracts in [
+        ("Base", ["Base"]),
+        ("Derived", ["Derived", "Base"]),
+        ("Other", ["Other"]),
+    ]:
+        contracts[name] = _declaration(
+            ContractDefinition,
+            name,
+            unit,
+            linearized_base_contracts=linearized_base_contracts,
+            reference_resolver=resolver,
+            source_unit=lambda: SimpleNamespace(cu_hash=b""),
+        )
+
+    selector_a = bytes.fromhex("01020304")
+    selector_b = bytes.fromhex("05060708")
+    contract_declarations = [
+        _declaration(cls, name, contracts[contract], function_selector=selector)
+        for contract, cls, name, selector in [
+            ("Base", FunctionDefinition, "transfer", selector_a),
+            ("Base", VariableDeclaration, "balance", None),
+            ("Base", FunctionDefinition, "def", selector_b),
+            ("Base", VariableDeclaration, "owner", selector_b),
+            # overrides keep the name of the base declaration
+            ("Derived", FunctionDefinition, "transfer", selector_a),
+            ("Derived", FunctionDefinition, "transfer", selector_b),
+            ("Derived", StructDefinition, "transfer", None),
+            ("Derived", VariableDeclaration, "owner", selector_b),
+            ("Derived", FunctionDefinition, "owner", selector_a),
+            ("Derived", EventDefinition, "__call__", None),
+            ("Derived", ErrorDefinition, "_call__", None),
+            ("Derived", VariableDeclaration, "def_", None),
+            # unrelated contracts and global names do not collide
+            ("Other", FunctionDefinition, "transfer", selector_b),
+            ("Other", FunctionDefinition, "Foo", None),
+        ]
+    ]
+    assert sanitize(contract_declarations) == [
+        "transfer",
+        "balance_",
+        "def_",
+        "owner",
+        "transfer",
+        "transfer_",
+        "transfer__",
+        "owner",
+        "owner_",
+        "_call__",
+        "_call___",
+        "def__",
+        "transfer",
+        "Foo",
+    ]
+
+    base = contracts["Base"]
+    function_parameters = _parameters(
+        FunctionDefinition,
+        ["self", "from", "from_", "a", "a", "value", "__init__", "_init__", "Foo"],
+        base,
+    )
+    assert sanitize(function_parameters) == [
+        "self_",
+        "from__",
+        "from___",
+        "a",
+        "a_",
+        "value_",
+        "_init__",
+        "_init___",
+        "Foo",
+    ]
+    event_parameters = _parameters(
+        EventDefinition,
+        ["selector", "origin", "a", "a", "lambda", "__init__", "_init__"],
+        base,
+    )
+    assert sanitize(event_parameters) == [
+        "selector_",
+        "origin_",
+        "a",
+        "a_",
+        "lambda_",
+        "_init__",
+        "_init___",
+    ]
+    error_parameters = _parameters(
+        ErrorDefinition, ["_abi", "selector", "original_name", "a", "a"], base
+    )
+    assert sanitize(error_parameters) == [
+        "_abi_",
+        "selector_",
+        "original_name_",
+        "a",
+        "a_",
+    ]
+
+    struct = _declaration(StructDefinition, "S", unit)
+    struct_members = [
+        _declaration(VariableDeclaration, name, struct)
+        for name in ["original_name", "x", "x", "__dict__", "_dict__", "async"]
+    ]
+    assert sanitize(struct_members) == [
+        "original_name_",
+        "x",
+        "x_",
+        "_dict__",
+        "_dict___",
+        "async_",
+    ]
+    enum = _declaration(EnumDefinition, "E", unit)
+    enum_values = [
+        _declaration(EnumValue, name, enum)
+        for name in ["None", "A", "A", "__members__"]
+    ]
+    assert sanitize(enum_values) == ["None_", "A", "A_", "_members__"]
+
+    # global names are assigned again for the next source unit
+    sanitizer.clear_global_renames()
+    assert sanitize(list(reversed(global_declarations))) == [
+        "None_",
+        "List7_",
+        "uint256_",
+        "_init__",
+        "_init___",
+        "_init____",
+        "Foo_",
+        "Foo",
+        "Foo__",
+        "class_",
+        "Contract_",
+    ]
+    assert sanitize(contract_declarations)[:2] == ["transfer", "balance_"]
+
+
+def test_name_sanitizer_unsupported_parents():
+    unit = object.__new__(SourceUnit)
+    contract = _declaration(ContractDefinition, "C", unit)
+    modifier_parameter = _parameters(ModifierDefinition, ["a"], contract)[0]
+    local_variable = _declaration(
+        VariableDeclaration, "b", _declaration(FunctionDefinition, "f", contract)
+    )
+
+    sanitizer = NameSanitizer()
+    for declaration in [modifier_parameter, local_variable]:
+        with pytest.raises(NotImplementedError):
+            sanitizer.sanitize_name(declaration)
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
-import asyncio
-import logging
+import functools
+import operator
+import os
 import sys
-import time
+from bisect import bisect_left
 from pathlib import Path
+from types import MappingProxyType
 from typing import (
     TYPE_CHECKING,
     AbstractSet,
     Any,
     Dict,
     FrozenSet,
+    Iterator,
     List,
+    Mapping,
     Optional,
     Sequence,
     Set,
@@ -32,10 +36,40 @@ if TYPE_CHECKING:
 logger = get_logger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _printer_entry_points():
+    if sys.version_info < (3, 10):
+        from importlib_metadata import entry_points
+    else:
+        from importlib.metadata import entry_points
+
+    return tuple(
+        sorted(
+            entry_points().select(group="wake.plugins.printers"),
+            key=operator.attrgetter("module"),
+        )
+    )
+
+
+def invalidate_printer_entry_points() -> None:
+    """
+    Clear the cached printer entry points, e.g. after a new plugin package was installed.
+    """
+    _printer_entry_points.cache_clear()
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_plugin_paths(
+    global_path: Path, plugin_paths: FrozenSet[Path]
+) -> Tuple[Path, ...]:
+    # global path is always loaded first, do not load it twice if also passed explicitly
+    return (global_path,) + tuple(sorted(plugin_paths - {global_path}))
+
+
 class PrintCli(click.RichGroup):  # pyright: ignore reportPrivateImportUsage
     _plugin_commands: Dict[str, click.Command] = {}
-    _failed_plugin_paths: Set[Tuple[Path, Exception]] = set()
-    _failed_plugin_entry_points: Set[Tuple[str, Exception]] = set()
+    _failed_plugin_paths: Dict[Path, Exception] = {}
+    _failed_plugin_entry_points: Dict[str, Exception] = {}
     _printer_collisions: Set[Tuple[str, str, str]] = set()
     _completion_mode: bool
     _global_data_path: Path
@@ -46,6 +80,9 @@ class PrintCli(click.RichGroup):  # pyright: ignore reportPrivateImportUsage
     printer_sources: Dict[str, Set[Union[str, Path]]] = {}
     _current_plugin: Union[str, Path] = ""
     _plugins_loaded: bool = False
+    _plugin_modules: Dict[Union[str, Path], Set[str]] = {}
+    _verified_paths: Optional[Set[Path]] = None
+    _sorted_module_names: Optional[List[str]] = None
 
     def __init__(
         self,
@@ -110,12 +147,12 @@ class PrintCli(click.RichGroup):  # pyright: ignore reportPrivateImportUsage
         )
 
     @property
-    def failed_plugin_paths(self) -> FrozenSet[Tuple[Path, Exception]]:
-        return frozenset(self._failed_plugin_paths)
+    def failed_plugin_paths(self) -> Mapping[Path, Exception]:
+        return MappingProxyType(self._failed_plugin_paths)
 
     @property
-    def failed_plugin_entry_points(self) -> FrozenSet[Tuple[str, Exception]]:
-        return frozenset(self._failed_plugin_entry_points)
+    def failed_plugin_entry_points(self) -> Mapping[str, Exception]:
+        return MappingProxyType(self._failed_plugin_entry_points)
 
     @property
     def printer_collisions(self) -> FrozenSet[Tuple[str, str, str]]:
@@ -126,75 +163,110 @@ class PrintCli(click.RichGroup):  # pyright: ignore reportPrivateImportUsage
         super().format_help(ctx, formatter)
         formatter.config.commands_panel_title = "Commands"
 
-    def add_verified_plugin_path(self, path: Path) -> None:
+    def _read_plugins_config(self) -> Dict[str, Any]:
         import tomli
-        import tomli_w
 
         try:
-            config = tomli.loads(self._plugins_config_path.read_text())
+            return tomli.loads(self._plugins_config_path.read_text())
         except FileNotFoundError:
-            config = {}
+            return {}
 
-        if "verified_paths" not in config:
-            config["verified_paths"] = []
-        else:
-            config["verified_paths"] = [
-                Path(p).resolve() for p in config["verified_paths"]
-            ]
-
-        if path not in config["verified_paths"]:
-            config["verified_paths"].append(path)
-            config["verified_paths"] = sorted(
-                [str(p) for p in config["verified_paths"]]
-            )
-            self._plugins_config_path.write_text(tomli_w.dumps(config))
+    def _load_verified(self, config: Optional[Dict[str, Any]] = None) -> Set[Path]:
+        if config is None:
+            config = self._read_plugins_config()
+        self._verified_paths = {
+            Path(p).resolve() for p in config.get("verified_paths", [])
+        }
+        return self._verified_paths
 
-    def _verify_plugin_path(self, path: Path) -> bool:
-        import tomli
+    def _write_verified(self) -> None:
         import tomli_w
+
+        assert self._verified_paths is not None
+
+        # merge with paths verified on disk since the set was loaded (e.g. by another process)
+        config = self._read_plugins_config()
+        self._verified_paths.update(
+            Path(p).resolve() for p in config.get("verified_paths", [])
+        )
+        config["verified_paths"] = sorted(str(p) for p in self._verified_paths)
+        self._plugins_config_path.write_text(tomli_w.dumps(config))
+
+    def add_verified_plugin_path(self, path: Path) -> None:
+        verified_paths = self._load_verified()
+
+        if path not in verified_paths:
+            verified_paths.add(path)
+            self._write_verified()
+
+    def _verify_plugin_path(self, path: Path) -> bool:
         from rich.prompt import Confirm
 
         if path == self._global_data_path / "global-printers":
             return True
 
-        try:
-            config = tomli.loads(self._plugins_config_path.read_text())
-        except FileNotFoundError:
-            config = {}
-
-        if "verified_paths" not in config:
-            config["verified_paths"] = []
-        else:
-            config["verified_paths"] = [
-                Path(p).resolve() for p in config["verified_paths"]
-            ]
+        verified_paths = self._verified_paths
+        if verified_paths is None:
+            verified_paths = self._load_verified()
 
-        if path not in config["verified_paths"]:
+        if path not in verified_paths:
             if self._completion_mode:
                 return False
 
             verified = Confirm.ask(f"Do you trust printers in {path}?", default=False)
             if verified:
-                config["verified_paths"].append(path)
-                config["verified_paths"] = sorted(
-                    [str(p) for p in config["verified_paths"]]
-                )
-                self._plugins_config_path.write_text(tomli_w.dumps(config))
+                verified_paths.add(path)
+                self._write_verified()
             return verified
         return True
 
+    @staticmethod
+    def _is_plugin_path(path: Path) -> bool:
+        # only a .py file or a package can be loaded with spec_from_file_location
+        if path.suffix == ".py":
+            return path.is_file()
+        if path.suffix != "":
+            return False
+        return (path / "__init__.py").is_file()
+
+    def _unload_plugin_modules(
+        self, plugin: Union[str, Path], module_name: str
+    ) -> None:
+        # unload target module and all its children
+        if self._sorted_module_names is None:
+            self._sorted_module_names = sorted(sys.modules.keys())
+        keys = self._sorted_module_names
+
+        # all children of the module lie between "module." and "module/" in sorted order;
+        # the scan also catches submodules imported lazily after the plugin was loaded
+        lo = bisect_left(keys, module_name + ".")
+        hi = bisect_left(keys, module_name + "/", lo)
+        modules = set(keys[lo:hi])
+        modules.add(module_name)
+        modules.update(self._plugin_modules.pop(plugin, ()))
+
+        for m in modules:
+            sys.modules.pop(m, None)
+
+    def _record_plugin_modules(
+        self, plugin: Union[str, Path], module_name: str, modules_before: Set[str]
+    ) -> None:
+        new_modules = sys.modules.keys() - modules_before
+        if len(new_modules) > 0:
+            self._sorted_module_names = None
+
+        prefix = module_name + "."
+        self._plugin_modules[plugin] = {
+            m for m in new_modules if m == module_name or m.startswith(prefix)
+        }
+
     def _load_plugins(
         self, plugin_paths: AbstractSet[Path], verify_paths: bool
     ) -> None:
-        import tomli
-
-        if sys.version_info < (3, 10):
-            from importlib_metadata import entry_points
-        else:
-            from importlib.metadata import entry_points
         from importlib.util import module_from_spec, spec_from_file_location
 
         self._loading_from_plugins = True
+        self._sorted_module_names = None
         for cmd in self.loaded_from_plugins.keys():
             self.commands.pop(cmd, None)
         self.loaded_from_plugins.clear()
@@ -203,50 +275,53 @@ class PrintCli(click.RichGroup):  # pyright: ignore reportPrivateImportUsage
         self._failed_plugin_entry_points.clear()
         self._printer_collisions.clear()
 
-        try:
-            self._loading_priorities = tomli.loads(
-                self._plugins_config_path.read_text()
-            ).get("printer_loading_priorities", {})
-        except FileNotFoundError:
-            self._loading_priorities = {}
+        config = self._read_plugins_config()
+        self._loading_priorities = config.get("printer_loading_priorities", {})
+        self._load_verified(config)
 
-        printer_entry_points = entry_points().select(group="wake.plugins.printers")
-        for entry_point in sorted(printer_entry_points, key=lambda e: e.module):
+        for entry_point in _printer_entry_points():
             self._current_plugin = entry_point.module
+            self._unload_plugin_modules(entry_point.module, entry_point.module)
 
-            # unload target module and all its children
-            for m in [
-                k
-                for k in sys.modules.keys()
-                if k == entry_point.module or k.startswith(entry_point.module + ".")
-            ]:
-                sys.modules.pop(m)
-
+            modules_before = set(sys.modules)
             try:
                 entry_point.load()
             except Exception as e:
-                self._failed_plugin_entry_points.add((entry_point.module, e))
+                self._failed_plugin_entry_points[entry_point.module] = e
                 if not self._completion_mode:
                     logger.error(
                         f"Failed to load printers from plugin module '{entry_point.module}': {e}"
                     )
+            finally:
+                self._record_plugin_modules(
+                    entry_point.module, entry_point.module, modules_before
+                )
 
-        for path in [self._global_data_path / "global-printers"] + sorted(plugin_paths):
-            if not path.exists() or (
-                verify_paths and not self._verify_plugin_path(path)
-            ):
+        for path in _resolve_plugin_paths(
+            self._global_data_path / "global-printers", frozenset(plugin_paths)
+        ):
+            if not path.exists():
+                continue
+            if not self._is_plugin_path(path):
+                # reported as failed without asking for trust or executing anything
+                e = ImportError(f"{path} is neither a .py file nor a package")
+                self._failed_plugin_paths[path] = e
+                if not self._completion_mode:
+                    logger.error(f"Failed to load printers from path {path}: {e}")
+                continue
+            if verify_paths and not self._verify_plugin_path(path):
                 continue
             self._current_plugin = path
-            sys.path.insert(0, str(path.parent))
+            # plugin directories stay on sys.path so that printers may import lazily,
+            # but do not add the same directory again on every reload
+            sys_path_entry = str(path.parent)
+            sys_path_added = sys_path_entry not in sys.path
+            if sys_path_added:
+                sys.path.insert(0, sys_path_entry)
+            self._unload_plugin_modules(path, path.stem)
+
+            modules_before = set(sys.modules)
             try:
-                # unload target module and all its children
-                for m in [
-                    k
-                    for k in sys.modules.keys()
-                    if k == path.stem or k.startswith(path.stem + ".")
-                ]:
-                    sys.modules.pop(m)
-
                 if path.is_dir():
                     spec = spec_from_file_location(path.stem, str(path / "__init__.py"))
                 else:
@@ -258,10 +333,13 @@ class PrintCli(click.RichGroup):  # pyright: ignore reportPrivateImportUsage
                 else:
                     raise RuntimeError(f"spec_from_file_location returned None")
             except Exception as e:
-                self._failed_plugin_paths.add((path, e))
-                sys.path.pop(0)
+                self._failed_plugin_paths[path] = e
+                if sys_path_added:
+                    sys.path.remove(sys_path_entry)
                 if not self._completion_mode:
                     logger.error(f"Failed to load printers from path {path}: {e}")
+            finally:
+                self._record_plugin_modules(path, path.stem, modules_before)
 
         self._loading_from_plugins = False
 
@@ -331,6 +409,9 @@ class PrintCli(click.RichGroup):  # pyright: ignore reportPrivateImportUsage
         force_load_plugins: bool = False,
         verify_paths: bool = True,
     ) -> Optional[click.Command]:
+        if force_load_plugins:
+            # pick up plugin packages installed since the last load
+            invalidate_printer_entry_points()
         if not self._plugins_loaded or force_load_plugins:
             self._load_plugins(plugin_paths, verify_paths)
             self._plugins_loaded = True
@@ -343,6 +424,9 @@ class PrintCli(click.RichGroup):  # pyright: ignore reportPrivateImportUsage
         force_load_plugins: bool = False,
         verify_paths: bool = True,
     ) -> List[str]:
+        if force_load_plugins:
+            # pick up plugin packages installed since the last load
+            invalidate_printer_entry_points()
         if not self._plugins_loaded or force_load_plugins:
             self._load_plugins(plugin_paths, verify_paths)
             self._plugins_loaded = True
@@ -354,6 +438,35 @@ class PrintCli(click.RichGroup):  # pyright: ignore reportPrivateImportUsage
         super().invoke(ctx)
 
 
+def _iter_sol_files(root: Path, exclude_paths: AbstractSet[Path]) -> Iterator[Path]:
+    """
+    Walk `root` using `os.scandir` and yield all `*.sol` files not located in any of `exclude_paths`.
+    Excluded directories are pruned without descending into them.
+    """
+    excluded = {os.fspath(p) for p in exclude_paths}
+    exclude_prefixes = tuple(os.path.join(p, "") for p in excluded)
+
+    if (os.fspath(root) + os.sep).startswith(exclude_prefixes):
+        return
+
+    stack = [os.fspath(root)]
+
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+
+        with it:
+            for entry in it:
+                if entry.path in excluded:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".sol") and entry.is_file():
+                    yield Path(entry.path)
+
+
 async def print_(
     config: WakeConfig,
     no_artifacts: bool,
@@ -362,6 +475,9 @@ async def print_(
     theme: str,
     watch: bool,
 ):
+    import asyncio
+    import time
+
     from rich.terminal_theme import DEFAULT_TERMINAL_THEME, SVG_EXPORT_THEME
     from watchdog.observers import Observer
 
@@ -371,7 +487,6 @@ async def print_(
     from ..compiler.build_data_model import ProjectBuild, ProjectBuildInfo
     from ..compiler.compiler import CompilationFileSystemEventHandler
     from ..compiler.solc_frontend import SolcOutputError, SolcOutputErrorSeverityEnum
-    from ..utils.file_utils import is_relative_to
     from .console import console
 
     ctx = click.get_current_context()
@@ -434,17 +549,13 @@ async def print_(
 
         console.record = False
 
-    sol_files: Set[Path] = set()
     start = time.perf_counter()
     with console.status("[bold green]Searching for *.sol files...[/]"):
-        for file in config.project_root_path.rglob("**/*.sol"):
-            if (
-                not any(
-                    is_relative_to(file, p) for p in config.compiler.solc.exclude_paths
-                )
-                and file.is_file()
-            ):
-                sol_files.add(file)
+        sol_files: Set[Path] = set(
+            _iter_sol_files(
+                config.project_root_path, config.compiler.solc.exclude_paths
+            )
+        )
     end = time.perf_counter()
     console.log(
         f"[green]Found {len(sol_files)} *.sol files in [bold green]{end - start:.2f} s[/bold green][/]"
@@ -632,11 +743,14 @@ def run_print(
 ) -> None:
     """Run a printer."""
 
-    if "--help" in ctx.obj["subcommand_args"]:
+    # help is printed by the subcommand itself, do not compile the project
+    if any(arg in ctx.help_option_names for arg in ctx.obj["subcommand_args"]):
         return
-    if ctx.invoked_subcommand == "list":
+    if ctx.invoked_subcommand in {None, "list"}:
         return
 
+    import asyncio
+
     from ..config import WakeConfig
 
     config = WakeConfig(local_config_path=ctx.obj.get("local_config_path", None))
@@ -204,9 +204,22 @@ class CompilationFileSystemEventHandler(FileSystemEventHandler):
             if file == self._config.local_config_path or file.suffix == ".sol":
                 self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
 
+    def _is_excluded_predicate(self) -> Callable[[Path], bool]:
+        # exclude paths are resolved, compare plain strings instead of calling is_relative_to per file
+        exclude_prefixes = tuple(
+            os.path.join(os.fspath(p), "")
+            for p in self._config.compiler.solc.exclude_paths
+        )
+
+        def is_excluded(file: Path) -> bool:
+            return (os.fspath(file) + os.sep).startswith(exclude_prefixes)
+
+        return is_excluded
+
     async def _compile(self):
         if self._config_changed:
             self._config.load_configs()
+            is_excluded = self._is_excluded_predicate()
 
             # find files that were previously ignored but are now included
             ctx_manager = (
@@ -218,13 +231,7 @@ class CompilationFileSystemEventHandler(FileSystemEventHandler):
             files = set()
             with ctx_manager:
                 for file in self._config.project_root_path.rglob("**/*.sol"):
-                    if (
-                        not any(
-                            is_relative_to(file, p)
-                            for p in self._config.compiler.solc.exclude_paths
-                        )
-                        and file.is_file()
-                    ):
+                    if not is_excluded(file) and file.is_file():
                         files.add(file)
             end = time.perf_counter()
             if self._console is not None:
@@ -234,16 +241,14 @@ class CompilationFileSystemEventHandler(FileSystemEventHandler):
 
             deleted_files = self._deleted_files
         else:
+            is_excluded = self._is_excluded_predicate()
             files = self._files.copy()
             files.update(self._created_files)
             files.update(self._modified_files)
             ignored_files = {
                 f
                 for f in files
-                if any(
-                    is_relative_to(f, p)
-                    for p in self._config.compiler.solc.exclude_paths
-                )
+                if is_excluded(f)
                 or not is_relative_to(f, self._config.project_root_path)
             }
             files.difference_update(ignored_files)
@@ -7,27 +7,32 @@ import os
 import re
 import shutil
 import string
-from collections import defaultdict, deque
-from copy import deepcopy
+import sys
+from binascii import unhexlify
+from collections import defaultdict
+from functools import lru_cache
+from hashlib import blake2b
 from operator import itemgetter
 from pathlib import Path
 from typing import (
     Any,
+    Callable,
     DefaultDict,
     Dict,
     FrozenSet,
     Iterable,
+    Iterator,
     List,
     Optional,
     Set,
     Tuple,
+    Type,
     Union,
 )
 from urllib.request import pathname2url
 
-import eth_utils
 import networkx as nx
-from Crypto.Hash import BLAKE2b, keccak
+from Crypto.Hash import keccak
 from intervaltree import IntervalTree
 from typing_extensions import Literal
 
@@ -62,17 +67,120 @@ from .constants import DEFAULT_IMPORTS, INIT_CONTENT, TAB_WIDTH
 logger = get_logger(__name__)
 
 
+# precomputed prefixes and suffixes for add_str_to_types, generated code is only nested a few levels deep
+_INDENTS = tuple(i * TAB_WIDTH * " " for i in range(16))
+_NEWLINES = tuple(i * "\n" for i in range(4))
+# List1 - List32 are predefined in wake.development.primitive_types
+_LIST_PREFIXES = tuple(f"List{i}[" for i in range(33))
+
+_DEPLOYABLE_CONTRACT_KINDS = frozenset({ContractKind.CONTRACT, ContractKind.LIBRARY})
+
+# shared by all deploy() overloads, only return_tx, request_type and the return type differ
+_DEPLOY_SIGNATURE = (
+    "def deploy(cls, {params}*, from_: Optional[Union[Account, Address, str]] = None, "
+    "value: Union[int, str] = 0, "
+    'gas_limit: Optional[Union[int, Literal["max"], Literal["auto"]]] = None, '
+    "return_tx: {return_tx}{libraries}, request_type: {request_type}, "
+    "chain: Optional[Chain] = None, gas_price: Optional[Union[int, str]] = None, "
+    "max_fee_per_gas: Optional[Union[int, str]] = None, "
+    "max_priority_fee_per_gas: Optional[Union[int, str]] = None, "
+    'access_list: Optional[Union[Dict[Union[Account, Address, str], List[int]], Literal["auto"]]] = None, '
+    "type: Optional[int] = None, "
+    'block: Optional[Union[int, Literal["latest"], Literal["pending"], Literal["earliest"], Literal["safe"], Literal["finalized"]]] = None, '
+    "confirmations: Optional[int] = None) -> {returns}:"
+)
+
+# shared by all generated function and getter overloads
+_FUNCTION_SIGNATURE = (
+    "def {name}(self, {params}*, from_: Optional[Union[Account, Address, str]] = None, "
+    "to: Optional[Union[Account, Address, str]] = None, value: Union[int, str] = 0, "
+    'gas_limit: Optional[Union[int, Literal["max"], Literal["auto"]]] = None, '
+    "request_type: {request_type}, gas_price: Optional[Union[int, str]] = None, "
+    "max_fee_per_gas: Optional[Union[int, str]] = None, "
+    "max_priority_fee_per_gas: Optional[Union[int, str]] = None, "
+    'access_list: Optional[Union[Dict[Union[Account, Address, str], List[int]], Literal["auto"]]] = None, '
+    "type: Optional[int] = None, "
+    'block: Optional[Union[int, Literal["latest"], Literal["pending"], Literal["earliest"], Literal["safe"], Literal["finalized"]]] = None, '
+    "confirmations: Optional[int] = None) -> {returns}:"
+)
+
+
+# deletes all ASCII characters except alphanumerics, "/" and "_"
+_NON_ALPHANUM_ASCII_TABLE = str.maketrans(
+    "",
+    "",
+    "".join(chr(c) for c in range(128) if not chr(c).isalnum() and chr(c) not in "/_"),
+)
+_DIGITS = tuple(string.digits)
+
+
+def _abi_type(abi_input: Dict[str, Any]) -> str:
+    t = abi_input["type"]
+    if t.startswith("tuple"):
+        return "(" + ",".join(map(_abi_type, abi_input["components"])) + ")" + t[5:]
+    return t
+
+
+# many contracts share the same function, error and event signatures
+@lru_cache(maxsize=8192)
+def _signature_hash(signature: str) -> bytes:
+    return keccak.new(data=signature.encode("utf-8"), digest_bits=256).digest()
+
+
+# full 32-byte hash (event topic), functions and errors use the first 4 bytes
+def _abi_selector(abi_item: Dict[str, Any]) -> bytes:
+    return _signature_hash(
+        f"{abi_item['name']}({','.join(map(_abi_type, abi_item['inputs']))})"
+    )
+
+
+# library selectors are computed from internal types without contract/struct/enum prefixes
+def _library_function_selector(abi_item: Dict[str, Any]) -> bytes:
+    input_types = []
+    for arg in abi_item["inputs"]:
+        internal_type: str = arg["internalType"]
+        for prefix in ("contract ", "struct ", "enum "):
+            if internal_type.startswith(prefix):
+                internal_type = internal_type[len(prefix) :]
+                break
+        input_types.append(internal_type)
+    return _signature_hash(f"{abi_item['name']}({','.join(input_types)})")[:4]
+
+
 # TODO ensure that making the path alphanum won't create collisions
+@lru_cache(maxsize=None)
 def _make_path_alphanum(source_unit_name: str) -> str:
-    filtered = "".join(
-        filter(lambda ch: ch.isalnum() or ch == "/" or ch == "_", source_unit_name)
-    )
+    if source_unit_name.isascii():
+        filtered = source_unit_name.translate(_NON_ALPHANUM_ASCII_TABLE)
+    else:
+        filtered = "".join(
+            filter(lambda ch: ch.isalnum() or ch == "/" or ch == "_", source_unit_name)
+        )
     return "/".join(
-        f"_{segment}" if segment.startswith(tuple(string.digits)) else segment
+        f"_{segment}" if segment.startswith(_DIGITS) else segment
         for segment in filtered.split("/")
     )
 
 
+# the same fqns are stored many times across the generated indexes
+def _get_fqn(contract: ContractDefinition) -> str:
+    return sys.intern(f"{contract.parent.source_unit_name}:{contract.name}")
+
+
+@lru_cache(maxsize=None)
+def _get_module_name(source_unit_name: str) -> str:
+    return "pytypes." + _make_path_alphanum(source_unit_name[:-3]).replace("/", ".")
+
+
+# type hint of the value returned by a generated function or getter
+def _format_returns(returns: List[Tuple[str, str]]) -> str:
+    if len(returns) == 0:
+        return "None"
+    elif len(returns) == 1:
+        return returns[0][0]
+    return f"Tuple[{', '.join(ret[0] for ret in returns)}]"
+
+
 def _binary_search(lines: List[Tuple[bytes, int]], x: int) -> int:
     l = 0
     r = len(lines)
@@ -94,64 +202,82 @@ def _path_to_uri(path: Path) -> str:
         return "file://" + pathname2url(str(path.resolve()))
 
 
+# PUSH1-PUSH32 consume the following token as their argument
+_OPCODE_RE = re.compile(r"PUSH([1-9]|[12]\d|3[0-2])(?= |\Z) ?(\S*)|(\S+)")
+_PUSH_ARGUMENT_RE = re.compile(r"0x[0-9a-fA-F]+")
+# PUSHn suffix -> (opcode name, instruction size)
+_PUSH_OPCODES: Dict[str, Tuple[str, int]] = {
+    str(n): (f"PUSH{n}", n + 1) for n in range(1, 33)
+}
+
+
 def _parse_opcodes(opcodes: str) -> List[Tuple[int, str, int, Optional[int]]]:
     pc_op_map = []
-    opcodes_spl = opcodes.split(" ")
-
     pc = 0
-    ignore = False
-
-    for i, opcode in enumerate(opcodes_spl):
-        if ignore:
-            ignore = False
-            continue
 
-        if not opcode.startswith("PUSH") or opcode == "PUSH0":
+    for push_size, push_arg, opcode in _OPCODE_RE.findall(opcodes):
+        if opcode:
             pc_op_map.append((pc, opcode, 1, None))
             pc += 1
         else:
-            size = int(opcode[4:]) + 1
-            pc_op_map.append((pc, opcode, size, int(opcodes_spl[i + 1], 16)))
+            opcode, size = _PUSH_OPCODES[push_size]
+            if _PUSH_ARGUMENT_RE.fullmatch(push_arg) is None:
+                raise ValueError(f"Invalid {opcode} argument at pc {pc}: '{push_arg}'")
+            pc_op_map.append((pc, opcode, size, int(push_arg, 16)))
             pc += size
-            ignore = True
     return pc_op_map
 
 
+# one source map item: start:length:file_id:jump_type:modifier_depth, all fields optional;
+# items start at the beginning or after ";" so that no empty item is matched after the last one
+_SOURCE_MAP_ITEM_RE = re.compile(
+    r"(?:^|(?<=;))([^:;]*)(?::([^:;]*))?(?::([^:;]*))?(?::([^:;]*))?(?::[^;]*)?(?:;|\Z)"
+)
+
+
 def _parse_source_map(
     source_map: str,
     pc_op_map: List[Tuple[int, str, int, Optional[int]]],
-) -> Dict[int, Tuple[int, int, int, Optional[str]]]:
-    pc_map = {}
-    last_data = [-1, -1, -1, None, None]
-
-    for i, sm_item in enumerate(source_map.split(";")):
-        pc, op, size, argument = pc_op_map[i]
-        source_spl = sm_item.split(":")
-        for x in range(len(source_spl)):
-            if source_spl[x] == "":
-                continue
-            if x < 3:
-                last_data[x] = int(source_spl[x])
-            else:
-                last_data[x] = source_spl[x]
-
-        pc_map[pc] = (
-            last_data[0],
-            last_data[0] + last_data[1],
-            last_data[2],
-            last_data[3],
-        )
-
-    return pc_map
+) -> List[Tuple[int, int, int, Optional[str]]]:
+    # i-th item describes the i-th instruction in pc_op_map
+    source_map_items = []
+    start = length = file_id = -1
+    jump_type = None
+
+    matches = _SOURCE_MAP_ITEM_RE.finditer(source_map)
+
+    # empty fields inherit the value from the previous item
+    for _, match in zip(pc_op_map, matches):
+        s, l, f, j = match.groups()
+        if s:
+            start = int(s)
+        if l:
+            length = int(l)
+        if f:
+            file_id = int(f)
+        if j:
+            jump_type = j
+
+        source_map_items.append((start, start + length, file_id, jump_type))
+
+    # the empty source map of empty bytecode (e.g. of an interface) still yields an empty match
+    if len(source_map) > 0 and next(matches, None) is not None:
+        raise ValueError("Source map has more items than there are opcodes")
+
+    # opcodes not covered by the source map (e.g. the appended metadata) have no source
+    source_map_items.extend(
+        [(-1, -1, -1, None)] * (len(pc_op_map) - len(source_map_items))
+    )
+    return source_map_items
 
 
 class TypeGenerator:
-    LIBRARY_PLACEHOLDER_REGEX = re.compile(r"__\$[0-9a-fA-F]{34}\$__")
+    LIBRARY_PLACEHOLDER_REGEX = re.compile(rb"__\$[0-9a-fA-F]{34}\$__")
 
     __config: WakeConfig
     __return_tx_obj: bool
-    # generated types for the given source unit
-    __source_unit_types: str
+    # generated types for the given source unit, joined when written to a file
+    __source_unit_types: List[str]
     # set of contracts that were already generated in the given source unit
     # used to avoid generating the same contract multiple times, eg. when multiple contracts inherit from it
     __already_generated_contracts: Set[str]
@@ -162,12 +288,10 @@ class TypeGenerator:
     __name_sanitizer: NameSanitizer
     __current_source_unit: str
     __pytypes_dir: Path
-    __sol_to_py_lookup: Dict[str, Tuple[str, str]]
-    # set of function names which should be overloaded
-    __func_to_overload: Set[str]
+    __sol_to_py_lookup: Dict[Type[types.TypeAbc], Tuple[str, str]]
     __contracts_index: Dict[str, Any]
-    __errors_index: Dict[bytes, Dict[str, Any]]
-    __events_index: Dict[bytes, Dict[str, Any]]
+    __errors_index: DefaultDict[bytes, Dict[str, Any]]
+    __events_index: DefaultDict[bytes, Dict[str, Any]]
     __user_defined_value_types_index: Dict[str, str]
     __contracts_by_metadata_index: Dict[bytes, str]
     __contracts_inheritance_index: Dict[str, Tuple[str, ...]]
@@ -179,11 +303,22 @@ class TypeGenerator:
     __cyclic_source_units: DefaultDict[str, Set[str]]
     # used to generate ListN types for N > 32
     __fixed_size_arrays: Set[int]
+    # (type, return_types) -> parsed type, valid only for the current source unit
+    __parsed_types: Dict[Tuple[types.TypeAbc, bool], str]
+    # (declaration, force_simple) -> name, valid only for the current source unit
+    __names: Dict[Tuple[DeclarationAbc, bool], str]
+    # contract -> error and event ABI items by selector
+    __errors_and_events_abi: Dict[ContractDefinition, Dict[bytes, Dict[str, Any]]]
+    # id of ABI item -> its repr, shared by contract, error and event pytypes
+    __abi_item_reprs: Dict[int, str]
+    # library fqn -> library id used in creation code placeholders
+    __library_ids: Dict[str, bytes]
+    __libraries_by_id: Dict[bytes, ContractDefinition]
 
     def __init__(self, config: WakeConfig, return_tx_obj: bool):
         self.__config = config
         self.__return_tx_obj = return_tx_obj
-        self.__source_unit_types = ""
+        self.__source_unit_types = []
         self.__already_generated_contracts = set()
         self.__source_units = {}
         self.__interval_trees = {}
@@ -194,10 +329,9 @@ class TypeGenerator:
         self.__pytypes_dir = config.project_root_path / "pytypes"
         self.__sol_to_py_lookup = {}
         self.__init_sol_to_py_types()
-        self.__func_to_overload = set()
         self.__contracts_index = {}
-        self.__errors_index = {}
-        self.__events_index = {}
+        self.__errors_index = defaultdict(dict)
+        self.__events_index = defaultdict(dict)
         self.__user_defined_value_types_index = {}
         self.__contracts_by_metadata_index = {}
         self.__contracts_inheritance_index = {}
@@ -207,6 +341,12 @@ class TypeGenerator:
         self.__line_indexes = {}
         self.__cyclic_source_units = defaultdict(set)
         self.__fixed_size_arrays = set()
+        self.__parsed_types = {}
+        self.__names = {}
+        self.__errors_and_events_abi = {}
+        self.__abi_item_reprs = {}
+        self.__library_ids = {}
+        self.__libraries_by_id = {}
 
         # built-in Error(str) and Panic(uint256) errors
         error_abi = {
@@ -221,8 +361,7 @@ class TypeGenerator:
         }
 
         for item in [error_abi, panic_abi]:
-            selector = eth_utils.abi.function_abi_to_4byte_selector(item)
-            self.__errors_index[selector] = {}
+            selector = _abi_selector(item)[:4]
             self.__errors_index[selector][""] = (
                 "wake.development.transactions",
                 (item["name"],),
@@ -260,17 +399,17 @@ class TypeGenerator:
 
     # TODO do some prettier init :)
     def __init_sol_to_py_types(self):
-        self.__sol_to_py_lookup[types.Address.__name__] = (
+        self.__sol_to_py_lookup[types.Address] = (
             "Union[Account, Address]",
             "Address",
         )
-        self.__sol_to_py_lookup[types.String.__name__] = ("str", "str")
-        self.__sol_to_py_lookup[types.Bool.__name__] = ("bool", "bool")
-        self.__sol_to_py_lookup[types.Bytes.__name__] = (
+        self.__sol_to_py_lookup[types.String] = ("str", "str")
+        self.__sol_to_py_lookup[types.Bool] = ("bool", "bool")
+        self.__sol_to_py_lookup[types.Bytes] = (
             "Union[bytearray, bytes]",
             "bytearray",
         )
-        self.__sol_to_py_lookup[types.Function.__name__] = ("Callable", "Callable")
+        self.__sol_to_py_lookup[types.Function] = ("Callable", "Callable")
 
     @property
     def current_source_unit(self) -> str:
@@ -283,14 +422,33 @@ class TypeGenerator:
     def add_str_to_types(
         self, num_of_indentation: int, string: str, num_of_newlines: int
     ):
-        self.__source_unit_types += (
-            num_of_indentation * TAB_WIDTH * " " + string + num_of_newlines * "\n"
+        self.__source_unit_types.append(
+            _INDENTS[num_of_indentation] + string + _NEWLINES[num_of_newlines]
         )
 
+    def add_strs_to_types(
+        self, num_of_indentation: int, strings: Iterable[str], num_of_newlines: int
+    ):
+        # used for large literals (ABI, bytecode) to avoid copying them when concatenating
+        self.__source_unit_types.append(_INDENTS[num_of_indentation])
+        self.__source_unit_types.extend(strings)
+        self.__source_unit_types.append(_NEWLINES[num_of_newlines])
+
+    def get_library_id(self, fqn: str) -> bytes:
+        if fqn not in self.__library_ids:
+            h = keccak.new(data=fqn.encode("utf-8"), digest_bits=256)
+            self.__library_ids[fqn] = h.digest()[:17]
+        return self.__library_ids[fqn]
+
     def get_name(
         self, declaration: DeclarationAbc, *, force_simple: bool = False
     ) -> str:
+        key = (declaration, force_simple)
+        if key in self.__names:
+            return self.__names[key]
+
         source_unit = declaration.parent
+        name = self.__name_sanitizer.sanitize_name(declaration)
 
         if (
             not force_simple
@@ -298,9 +456,10 @@ class TypeGenerator:
             and source_unit.source_unit_name != self.current_source_unit
             and source_unit.source_unit_name in self.cyclic_source_units
         ):
-            n = self.__name_sanitizer.sanitize_name(declaration)
-            return f"{n}.{n}"
-        return self.__name_sanitizer.sanitize_name(declaration)
+            name = f"{name}.{name}"
+
+        self.__names[key] = name
+        return name
 
     def generate_deploy_func(
         self, contract: ContractDefinition, libraries: Dict[bytes, Tuple[str, str]]
@@ -343,67 +502,59 @@ class TypeGenerator:
                 )
                 break
 
-        # generate @overload stubs
-        self.add_str_to_types(1, "@overload", 1)
-        self.add_str_to_types(1, "@classmethod", 1)
-        self.add_str_to_types(
-            1,
-            f"""def deploy(cls, {params_str}*, from_: Optional[Union[Account, Address, str]] = None, value: Union[int, str] = 0, gas_limit: Optional[Union[int, Literal["max"], Literal["auto"]]] = None, return_tx: Literal[False]{'' if self.__return_tx_obj else ' = False'}{libraries_str}, request_type: Literal["call"], chain: Optional[Chain] = None, gas_price: Optional[Union[int, str]] = None, max_fee_per_gas: Optional[Union[int, str]] = None, max_priority_fee_per_gas: Optional[Union[int, str]] = None, access_list: Optional[Union[Dict[Union[Account, Address, str], List[int]], Literal["auto"]]] = None, type: Optional[int] = None, block: Optional[Union[int, Literal["latest"], Literal["pending"], Literal["earliest"], Literal["safe"], Literal["finalized"]]] = None, confirmations: Optional[int] = None) -> bytearray:""",
-            1,
-        )
-        generate_docstring()
-        self.add_str_to_types(2, "...", 2)
-
-        self.add_str_to_types(1, "@overload", 1)
-        self.add_str_to_types(1, "@classmethod", 1)
-        self.add_str_to_types(
-            1,
-            f"""def deploy(cls, {params_str}*, from_: Optional[Union[Account, Address, str]] = None, value: Union[int, str] = 0, gas_limit: Optional[Union[int, Literal["max"], Literal["auto"]]] = None, return_tx: Literal[False]{'' if self.__return_tx_obj else ' = False'}{libraries_str}, request_type: Literal["tx"] = "tx", chain: Optional[Chain] = None, gas_price: Optional[Union[int, str]] = None, max_fee_per_gas: Optional[Union[int, str]] = None, max_priority_fee_per_gas: Optional[Union[int, str]] = None, access_list: Optional[Union[Dict[Union[Account, Address, str], List[int]], Literal["auto"]]] = None, type: Optional[int] = None, block: Optional[Union[int, Literal["latest"], Literal["pending"], Literal["earliest"], Literal["safe"], Literal["finalized"]]] = None, confirmations: Optional[int] = None) -> {contract_name}:""",
-            1,
+        return_tx_false = "Literal[False]" + (
+            "" if self.__return_tx_obj else " = False"
         )
-        generate_docstring()
-        self.add_str_to_types(2, "...", 2)
+        return_tx_true = "Literal[True]" + (" = True" if self.__return_tx_obj else "")
 
-        self.add_str_to_types(1, "@overload", 1)
-        self.add_str_to_types(1, "@classmethod", 1)
-        self.add_str_to_types(
-            1,
-            f"""def deploy(cls, {params_str}*, from_: Optional[Union[Account, Address, str]] = None, value: Union[int, str] = 0, gas_limit: Optional[Union[int, Literal["max"], Literal["auto"]]] = None, return_tx: Literal[False]{'' if self.__return_tx_obj else ' = False'}{libraries_str}, request_type: Literal["estimate"], chain: Optional[Chain] = None, gas_price: Optional[Union[int, str]] = None, max_fee_per_gas: Optional[Union[int, str]] = None, max_priority_fee_per_gas: Optional[Union[int, str]] = None, access_list: Optional[Union[Dict[Union[Account, Address, str], List[int]], Literal["auto"]]] = None, type: Optional[int] = None, block: Optional[Union[int, Literal["latest"], Literal["pending"], Literal["earliest"], Literal["safe"], Literal["finalized"]]] = None, confirmations: Optional[int] = None) -> int:""",
-            1,
-        )
-        generate_docstring()
-        self.add_str_to_types(2, "...", 2)
-
-        self.add_str_to_types(1, "@overload", 1)
-        self.add_str_to_types(1, "@classmethod", 1)
-        self.add_str_to_types(
-            1,
-            f"""def deploy(cls, {params_str}*, from_: Optional[Union[Account, Address, str]] = None, value: Union[int, str] = 0, gas_limit: Optional[Union[int, Literal["max"], Literal["auto"]]] = None, return_tx: Literal[False]{'' if self.__return_tx_obj else ' = False'}{libraries_str}, request_type: Literal["access_list"], chain: Optional[Chain] = None, gas_price: Optional[Union[int, str]] = None, max_fee_per_gas: Optional[Union[int, str]] = None, max_priority_fee_per_gas: Optional[Union[int, str]] = None, access_list: Optional[Union[Dict[Union[Account, Address, str], List[int]], Literal["auto"]]] = None, type: Optional[int] = None, block: Optional[Union[int, Literal["latest"], Literal["pending"], Literal["earliest"], Literal["safe"], Literal["finalized"]]] = None, confirmations: Optional[int] = None) -> Tuple[Dict[Address, List[int]], int]:""",
-            1,
-        )
-        generate_docstring()
-        self.add_str_to_types(2, "...", 2)
-
-        self.add_str_to_types(1, "@overload", 1)
-        self.add_str_to_types(1, "@classmethod", 1)
-        self.add_str_to_types(
-            1,
-            f"""def deploy(cls, {params_str}*, from_: Optional[Union[Account, Address, str]] = None, value: Union[int, str] = 0, gas_limit: Optional[Union[int, Literal["max"], Literal["auto"]]] = None, return_tx: Literal[True]{' = True' if self.__return_tx_obj else ''}{libraries_str}, request_type: Literal["tx"] = "tx", chain: Optional[Chain] = None, gas_price: Optional[Union[int, str]] = None, max_fee_per_gas: Optional[Union[int, str]] = None, max_priority_fee_per_gas: Optional[Union[int, str]] = None, access_list: Optional[Union[Dict[Union[Account, Address, str], List[int]], Literal["auto"]]] = None, type: Optional[int] = None, block: Optional[Union[int, Literal["latest"], Literal["pending"], Literal["earliest"], Literal["safe"], Literal["finalized"]]] = None, confirmations: Optional[int] = None) -> TransactionAbc[{contract_name}]:""",
-            1,
-        )
-        generate_docstring()
-        self.add_str_to_types(2, "...", 2)
+        # generate @overload stubs
+        for return_tx, request_type, returns in (
+            (return_tx_false, 'Literal["call"]', "bytearray"),
+            (return_tx_false, 'Literal["tx"] = "tx"', contract_name),
+            (return_tx_false, 'Literal["estimate"]', "int"),
+            (
+                return_tx_false,
+                'Literal["access_list"]',
+                "Tuple[Dict[Address, List[int]], int]",
+            ),
+            (
+                return_tx_true,
+                'Literal["tx"] = "tx"',
+                f"TransactionAbc[{contract_name}]",
+            ),
+        ):
+            self.add_str_to_types(1, "@overload", 1)
+            self.add_str_to_types(1, "@classmethod", 1)
+            self.add_str_to_types(
+                1,
+                _DEPLOY_SIGNATURE.format(
+                    params=params_str,
+                    return_tx=return_tx,
+                    libraries=libraries_str,
+                    request_type=request_type,
+                    returns=returns,
+                ),
+                1,
+            )
+            generate_docstring()
+            self.add_str_to_types(2, "...", 2)
 
         self.add_str_to_types(1, "@classmethod", 1)
         self.add_str_to_types(
             1,
-            f'def deploy(cls, {params_str}*, from_: Optional[Union[Account, Address, str]] = None, value: Union[int, str] = 0, gas_limit: Optional[Union[int, Literal["max"], Literal["auto"]]] = None, return_tx: bool = {self.__return_tx_obj}{libraries_str}, request_type: RequestType = "tx", chain: Optional[Chain] = None, gas_price: Optional[Union[int, str]] = None, max_fee_per_gas: Optional[Union[int, str]] = None, max_priority_fee_per_gas: Optional[Union[int, str]] = None, access_list: Optional[Union[Dict[Union[Account, Address, str], List[int]], Literal["auto"]]] = None, type: Optional[int] = None, block: Optional[Union[int, Literal["latest"], Literal["pending"], Literal["earliest"], Literal["safe"], Literal["finalized"]]] = None, confirmations: Optional[int] = None) -> Union[bytearray, {contract_name}, int, Tuple[Dict[Address, List[int]], int], TransactionAbc[{contract_name}]]:',
+            _DEPLOY_SIGNATURE.format(
+                params=params_str,
+                return_tx=f"bool = {self.__return_tx_obj}",
+                libraries=libraries_str,
+                request_type='RequestType = "tx"',
+                returns=f"Union[bytearray, {contract_name}, int, Tuple[Dict[Address, List[int]], int], TransactionAbc[{contract_name}]]",
+            ),
             1,
         )
 
         generate_docstring()
 
-        if contract.kind in {ContractKind.CONTRACT, ContractKind.LIBRARY}:
+        if contract.kind in _DEPLOYABLE_CONTRACT_KINDS:
             if not contract.abstract:
                 libs_arg = (
                     "{"
@@ -439,7 +590,7 @@ class TypeGenerator:
             1,
         )
 
-        if contract.kind in {ContractKind.CONTRACT, ContractKind.LIBRARY}:
+        if contract.kind in _DEPLOYABLE_CONTRACT_KINDS:
             if not contract.abstract:
                 libs_arg = (
                     "{"
@@ -469,13 +620,18 @@ class TypeGenerator:
         self,
         contract: ContractDefinition,
         fqn: str,
-        parsed_opcodes,
-        pc_map,
+        parsed_opcodes: List[Tuple[int, str, int, Optional[int]]],
+        source_map_items: List[Tuple[int, int, int, Optional[str]]],
         index: Dict[str, Set[int]],
     ) -> None:
-        for pc, op, size, argument in parsed_opcodes:
-            if op == "REVERT" and pc in pc_map:
-                start, end, file_id, _ = pc_map[pc]
+        # solc emits many REVERTs mapped to the same source range
+        reverting_ranges: Dict[Tuple[Path, int, int], bool] = {}
+
+        assert len(parsed_opcodes) == len(source_map_items)
+        for (pc, op, _, _), (start, end, file_id, _) in zip(
+            parsed_opcodes, source_map_items
+        ):
+            if op == "REVERT":
                 if file_id == -1:
                     continue
                 try:
@@ -485,23 +641,30 @@ class TypeGenerator:
                 except KeyError:
                     continue
 
-                intervals = self.__interval_trees[path].envelop(start, end)
-                nodes: List = sorted(
-                    [interval.data for interval in intervals],
-                    key=lambda n: n.ast_tree_depth,
-                )
-
-                if len(nodes) > 0:
-                    node = nodes[0]
+                key = (path, start, end)
+                if key not in reverting_ranges:
+                    node = min(
+                        (
+                            interval.data
+                            for interval in self.__interval_trees[path].envelop(
+                                start, end
+                            )
+                        ),
+                        key=lambda n: n.ast_tree_depth,
+                        default=None,
+                    )
                     if isinstance(node, FunctionCall) and isinstance(
                         node.parent, RevertStatement
                     ):
-                        func_called = node.function_called
-                        assert isinstance(func_called, ErrorDefinition)
+                        assert isinstance(node.function_called, ErrorDefinition)
+                        reverting_ranges[key] = True
+                    else:
+                        reverting_ranges[key] = False
 
-                        if fqn not in index:
-                            index[fqn] = set()
-                        index[fqn].add(pc)
+                if reverting_ranges[key]:
+                    if fqn not in index:
+                        index[fqn] = set()
+                    index[fqn].add(pc)
 
     def generate_contract_template(
         self, contract: ContractDefinition, base_names: str
@@ -536,27 +699,27 @@ class TypeGenerator:
         assert compilation_info.evm.deployed_bytecode.opcodes is not None
         assert compilation_info.evm.deployed_bytecode.source_map is not None
 
-        fqn = f"{contract.parent.source_unit_name}:{contract.name}"
+        fqn = _get_fqn(contract)
 
         for bytecode, index in [
             (compilation_info.evm.bytecode, self.__contracts_revert_constructor_index),
             (compilation_info.evm.deployed_bytecode, self.__contracts_revert_index),
         ]:
             parsed_opcodes = _parse_opcodes(bytecode.opcodes)
-            pc_map = _parse_source_map(bytecode.source_map, parsed_opcodes)
+            source_map_items = _parse_source_map(bytecode.source_map, parsed_opcodes)
             self._process_opcodes_for_revert(
                 contract,
                 fqn,
                 parsed_opcodes,
-                pc_map,
+                source_map_items,
                 index,
             )
 
-        if len(compilation_info.evm.deployed_bytecode.object) > 0:
-            metadata = bytes.fromhex(
-                compilation_info.evm.deployed_bytecode.object[-106:]
-            )
-            assert len(metadata) == 53
+        deployed_bytecode = compilation_info.evm.deployed_bytecode.object
+        if len(deployed_bytecode) > 0:
+            # CBOR encoded metadata (51 bytes) + its length (2 bytes) at the end
+            assert len(deployed_bytecode) >= 106
+            metadata = bytes.fromhex(deployed_bytecode[-106:])
             assert metadata not in self.__contracts_by_metadata_index
             self.__contracts_by_metadata_index[metadata] = fqn
 
@@ -564,8 +727,7 @@ class TypeGenerator:
             fqn not in self.__contracts_inheritance_index
         ), f"Generating contract {fqn} twice"
         self.__contracts_inheritance_index[fqn] = tuple(
-            f"{base.parent.source_unit_name}:{base.name}"
-            for base in contract.linearized_base_contracts
+            _get_fqn(base) for base in contract.linearized_base_contracts
         )
 
         abi_by_selector: Dict[
@@ -575,38 +737,22 @@ class TypeGenerator:
             Dict,
         ] = {}
 
-        module_name = "pytypes." + _make_path_alphanum(
-            contract.parent.source_unit_name[:-3]
-        ).replace("/", ".")
+        # used_events is recomputed on every access, index it once per contract
+        events_by_selector: Dict[bytes, EventDefinition] = {}
+        for event in contract.used_events:
+            events_by_selector.setdefault(event.event_selector, event)
 
         for item in compilation_info.abi:
             if item["type"] == "function":
                 if contract.kind == ContractKind.LIBRARY:
-                    item_copy = deepcopy(item)
-                    for arg in item_copy["inputs"]:
-                        if arg["internalType"].startswith("contract "):
-                            arg["internalType"] = arg["internalType"][9:]
-                        elif arg["internalType"].startswith("struct "):
-                            arg["internalType"] = arg["internalType"][7:]
-                        elif arg["internalType"].startswith("enum "):
-                            arg["internalType"] = arg["internalType"][5:]
-
-                    selector = keccak.new(
-                        data=f"{item['name']}({','.join(arg['internalType'] for arg in item_copy['inputs'])})".encode(
-                            "utf-8"
-                        ),
-                        digest_bits=256,
-                    ).digest()[:4]
+                    selector = _library_function_selector(item)
                 else:
-                    selector = eth_utils.abi.function_abi_to_4byte_selector(item)
+                    selector = _abi_selector(item)[:4]
                 abi_by_selector[selector] = item
             elif item["type"] == "error":
-                selector = eth_utils.abi.function_abi_to_4byte_selector(item)
+                selector = _abi_selector(item)[:4]
                 abi_by_selector[selector] = item
 
-                if selector not in self.__errors_index:
-                    self.__errors_index[selector] = {}
-
                 # find where the error is declared
                 error_decl = None
                 for error in contract.used_errors:
@@ -617,17 +763,17 @@ class TypeGenerator:
 
                 if isinstance(error_decl.parent, ContractDefinition):
                     # error is declared in a contract
-                    error_module_name = "pytypes." + _make_path_alphanum(
-                        error_decl.parent.parent.source_unit_name[:-3]
-                    ).replace("/", ".")
+                    error_module_name = _get_module_name(
+                        error_decl.parent.parent.source_unit_name
+                    )
                     self.__errors_index[selector][fqn] = (
                         error_module_name,
                         (self.get_name(error_decl.parent), self.get_name(error_decl)),
                     )
                 elif isinstance(error_decl.parent, SourceUnit):
-                    error_module_name = "pytypes." + _make_path_alphanum(
-                        error_decl.parent.source_unit_name[:-3]
-                    ).replace("/", ".")
+                    error_module_name = _get_module_name(
+                        error_decl.parent.source_unit_name
+                    )
                     self.__errors_index[selector][fqn] = (
                         error_module_name,
                         (self.get_name(error_decl),),
@@ -635,34 +781,27 @@ class TypeGenerator:
                 else:
                     raise Exception("Unknown error parent")
             elif item["type"] == "event":
-                selector = eth_utils.abi.event_abi_to_log_topic(item)
+                selector = _abi_selector(item)
                 abi_by_selector[selector] = item
 
-                event_decl = None
-                for event in contract.used_events:
-                    if event.event_selector == selector:
-                        event_decl = event
-                        break
+                event_decl = events_by_selector.get(selector)
                 if event_decl is None:
                     continue
 
-                if selector not in self.__events_index:
-                    self.__events_index[selector] = {}
-
                 # TODO: a contract may use two different events with the same selector when emitting events declared in other contracts
                 if isinstance(event_decl.parent, ContractDefinition):
                     # event is declared in a contract
-                    event_module_name = "pytypes." + _make_path_alphanum(
-                        event_decl.parent.parent.source_unit_name[:-3]
-                    ).replace("/", ".")
+                    event_module_name = _get_module_name(
+                        event_decl.parent.parent.source_unit_name
+                    )
                     self.__events_index[selector][fqn] = (
                         event_module_name,
                         (self.get_name(event_decl.parent), self.get_name(event_decl)),
                     )
                 elif isinstance(event_decl.parent, SourceUnit):
-                    event_module_name = "pytypes." + _make_path_alphanum(
-                        event_decl.parent.source_unit_name[:-3]
-                    ).replace("/", ".")
+                    event_module_name = _get_module_name(
+                        event_decl.parent.source_unit_name
+                    )
                     self.__events_index[selector][fqn] = (
                         event_module_name,
                         (self.get_name(event_decl),),
@@ -673,26 +812,45 @@ class TypeGenerator:
                 abi_by_selector[item["type"]] = item
             else:
                 raise Exception(f"Unexpected ABI item type: {item['type']}")
-        self.add_str_to_types(1, f"_abi = {abi_by_selector}", 1)
+        # same as repr(abi_by_selector), but error and event items are reused in their pytypes
+        self.add_strs_to_types(
+            1,
+            (
+                "_abi = {",
+                ", ".join(
+                    f"{selector!r}: {self.__get_abi_item_repr(item)}"
+                    for selector, item in abi_by_selector.items()
+                ),
+                "}",
+            ),
+            1,
+        )
 
         if compilation_info.storage_layout is not None:
-            self.add_str_to_types(
+            self.add_strs_to_types(
                 1,
-                f"_storage_layout = {compilation_info.storage_layout.model_dump_json(by_alias=True, exclude_none=True)}",
+                (
+                    "_storage_layout = ",
+                    compilation_info.storage_layout.model_dump_json(
+                        by_alias=True, exclude_none=True
+                    ),
+                ),
                 1,
             )
 
-        self.add_str_to_types(
-            1, f'_creation_code = "{compilation_info.evm.bytecode.object}"', 2
+        self.add_strs_to_types(
+            1, ('_creation_code = "', compilation_info.evm.bytecode.object, '"'), 2
         )
 
         if contract.kind == ContractKind.LIBRARY:
-            lib_id = keccak.new(data=fqn.encode("utf-8"), digest_bits=256).digest()[:17]
+            lib_id = self.get_library_id(fqn)
             self.add_str_to_types(1, f"_library_id = {lib_id}", 2)
 
         # find all needed libraries
         lib_ids: Set[bytes] = set()
-        bytecode = compilation_info.evm.bytecode.object
+        # scan and slice the hex encoded creation code as bytes to avoid copying it
+        bytecode = compilation_info.evm.bytecode.object.encode("ascii")
+        bytecode_view = memoryview(bytecode)
 
         if len(bytecode) > 0:
             bytecode_segments: List[Tuple[int, bytes]] = []
@@ -702,46 +860,31 @@ class TypeGenerator:
             for match in self.__class__.LIBRARY_PLACEHOLDER_REGEX.finditer(bytecode):
                 s = match.start()
                 e = match.end()
-                segment = bytes.fromhex(bytecode[start:s])
-                h = BLAKE2b.new(data=segment, digest_bits=256).digest()
+                segment = unhexlify(bytecode_view[start:s])
+                h = blake2b(segment, digest_size=32).digest()
                 bytecode_segments.append((len(segment), h))
                 start = e
-                lib_id = bytes.fromhex(bytecode[s + 3 : e - 3])
+                lib_id = unhexlify(bytecode_view[s + 3 : e - 3])
                 lib_ids.add(lib_id)
 
-            fqn = f"{contract.parent.source_unit_name}:{contract.name}"
-
-            segment = bytes.fromhex(bytecode[start:])
-            h = BLAKE2b.new(data=segment, digest_bits=256).digest()
+            segment = unhexlify(bytecode_view[start:])
+            h = blake2b(segment, digest_size=32).digest()
             bytecode_segments.append((len(segment), h))
 
             self.__creation_code_index.append((tuple(bytecode_segments), fqn))
 
-        libraries: Dict[bytes, Tuple[str, str]] = {}
-        source_units_queue = deque([contract.parent])
-
-        while len(source_units_queue) > 0 and len(lib_ids) > 0:
-            source_unit = source_units_queue.popleft()
-            for c in source_unit.contracts:
-                if c.kind == ContractKind.LIBRARY:
-                    fqn = f"{c.parent.source_unit_name}:{c.name}"
-                    lib_id = keccak.new(
-                        data=fqn.encode("utf-8"), digest_bits=256
-                    ).digest()[:17]
-
-                    if lib_id in lib_ids:
-                        lib_ids.remove(lib_id)
-                        self.__imports.generate_contract_import(c)
-                        libraries[lib_id] = (
-                            c.name[0].lower() + c.name[1:],
-                            self.get_name(c),
-                        )
-
-            source_units_queue.extend(
-                imp.imported_source_unit for imp in source_unit.imports
-            )
+        assert all(
+            lib_id in self.__libraries_by_id for lib_id in lib_ids
+        ), "Not all libraries were found"
 
-        assert len(lib_ids) == 0, "Not all libraries were found"
+        # keep the order of library arguments deterministic
+        libraries: Dict[bytes, Tuple[str, str]] = {}
+        for lib_id, c in sorted(
+            ((lib_id, self.__libraries_by_id[lib_id]) for lib_id in lib_ids),
+            key=lambda item: (item[1].parent.source_unit_name, item[1].name),
+        ):
+            self.__imports.generate_contract_import(c)
+            libraries[lib_id] = (c.name[0].lower() + c.name[1:], self.get_name(c))
 
         self.generate_deploy_func(contract, libraries)
         self.add_str_to_types(0, "", 1)
@@ -815,6 +958,57 @@ class TypeGenerator:
                 num += 1
             self.add_str_to_types(0, "", 2)
 
+    def __get_errors_and_events_abi(
+        self, contract: ContractDefinition
+    ) -> Dict[bytes, Dict[str, Any]]:
+        # error selectors (4 bytes) and event topics (32 bytes) cannot collide
+        if contract not in self.__errors_and_events_abi:
+            compilation_info = contract.compilation_info
+            assert compilation_info is not None
+            assert compilation_info.abi is not None
+
+            abi: Dict[bytes, Dict[str, Any]] = {}
+            for item in compilation_info.abi:
+                if item["type"] == "error":
+                    abi.setdefault(_abi_selector(item)[:4], item)
+                elif item["type"] == "event":
+                    abi.setdefault(_abi_selector(item), item)
+            self.__errors_and_events_abi[contract] = abi
+        return self.__errors_and_events_abi[contract]
+
+    def __generate_attributes_docstring(
+        self,
+        declaration: Union[ErrorDefinition, EventDefinition],
+        parameters: List[Tuple[str, str, str, str]],
+        indent: int,
+    ) -> None:
+        line, _ = self.__get_line_pos_from_byte_offset(
+            declaration.source_unit.file, declaration.byte_location[0]
+        )
+        indent_str = _INDENTS[indent]
+        doc_lines = [
+            indent_str + '"""',
+            f"{indent_str}[Source code]({_path_to_uri(declaration.source_unit.file)}#{line + 1})",
+        ]
+        if len(parameters) > 0:
+            param_indent_str = _INDENTS[indent + 1]
+            doc_lines.append("")
+            doc_lines.append(indent_str + "Attributes:")
+            doc_lines.extend(
+                f"{param_indent_str}{param_name} ({param_type}): {param_type_desc}"
+                for param_name, param_type, param_type_desc, _ in parameters
+            )
+        doc_lines.append(indent_str + '"""')
+        doc_lines.append("")
+        self.__source_unit_types.append("\n".join(doc_lines))
+
+    def __get_abi_item_repr(self, abi_item: Dict[str, Any]) -> str:
+        # ABI items are owned by compilation info that outlives the generator, ids are stable
+        key = id(abi_item)
+        if key not in self.__abi_item_reprs:
+            self.__abi_item_reprs[key] = repr(abi_item)
+        return self.__abi_item_reprs[key]
+
     def generate_types_error(
         self,
         errors: Iterable[ErrorDefinition],
@@ -826,18 +1020,9 @@ class TypeGenerator:
                 continue
 
             used_in = next(iter(error.used_in))
-            assert used_in.compilation_info is not None
-            assert used_in.compilation_info.abi is not None
-
-            error_abi = None
-
-            for item in used_in.compilation_info.abi:
-                if item["type"] == "error" and item["name"] == error.name:
-                    selector = eth_utils.abi.function_abi_to_4byte_selector(item)
-                    if selector == error.error_selector:
-                        error_abi = item
-                        break
-
+            error_abi = self.__get_errors_and_events_abi(used_in).get(
+                error.error_selector
+            )
             assert error_abi is not None
 
             parameters: List[Tuple[str, str, str, str]] = []
@@ -866,25 +1051,10 @@ class TypeGenerator:
                 1,
             )
 
-            line, _ = self.__get_line_pos_from_byte_offset(
-                error.source_unit.file, error.byte_location[0]
+            self.__generate_attributes_docstring(error, parameters, indent + 1)
+            self.add_strs_to_types(
+                indent + 1, ("_abi = ", self.__get_abi_item_repr(error_abi)), 1
             )
-            self.add_str_to_types(indent + 1, '"""', 1)
-            self.add_str_to_types(
-                indent + 1,
-                f"[Source code]({_path_to_uri(error.source_unit.file)}#{line + 1})",
-                1 if len(parameters) == 0 else 2,
-            )
-
-            if len(parameters) > 0:
-                self.add_str_to_types(indent + 1, "Attributes:", 1)
-                for param_name, param_type, param_type_desc, _ in parameters:
-                    self.add_str_to_types(
-                        indent + 2, f"{param_name} ({param_type}): {param_type_desc}", 1
-                    )
-
-            self.add_str_to_types(indent + 1, '"""', 1)
-            self.add_str_to_types(indent + 1, f"_abi = {error_abi}", 1)
             self.add_str_to_types(indent + 1, f"original_name = '{error.name}'", 1)
             self.add_str_to_types(indent + 1, f"selector = {error.error_selector}", 2)
             for param_name, param_type, _, original_name in parameters:
@@ -909,18 +1079,9 @@ class TypeGenerator:
                 continue
 
             used_in = next(iter(event.used_in))
-            assert used_in.compilation_info is not None
-            assert used_in.compilation_info.abi is not None
-
-            event_abi = None
-
-            for item in used_in.compilation_info.abi:
-                if item["type"] == "event" and item["name"] == event.name:
-                    selector = eth_utils.abi.event_abi_to_log_topic(item)
-                    if selector == event.event_selector:
-                        event_abi = item
-                        break
-
+            event_abi = self.__get_errors_and_events_abi(used_in).get(
+                event.event_selector
+            )
             assert event_abi is not None
 
             parameters: List[Tuple[str, str, str, str]] = []
@@ -932,18 +1093,22 @@ class TypeGenerator:
                     parameter_name = f"param{unnamed_params_index}"
                     unnamed_params_index += 1
 
-                if parameter.indexed and isinstance(
-                    parameter.type,
-                    (types.Array, types.Struct, types.Bytes, types.String),
-                ):
-                    parameter_name += "_hash"
-                    parameter_type = "bytes"
-                else:
+                if not parameter.indexed:
                     parameter_type = self.parse_type_and_import(parameter.type, True)
-                if parameter.indexed:
-                    parameter_type_desc = "indexed " + parameter.type_string
-                else:
                     parameter_type_desc = parameter.type_string
+                else:
+                    if isinstance(
+                        parameter.type,
+                        (types.Array, types.Struct, types.Bytes, types.String),
+                    ):
+                        parameter_name += "_hash"
+                        parameter_type = "bytes"
+                    else:
+                        # indexed value types are mostly leaves that need no imports
+                        parameter_type = self.__parse_leaf_type(
+                            parameter.type, True
+                        ) or self.parse_type_and_import(parameter.type, True)
+                    parameter_type_desc = "indexed " + parameter.type_string
                 parameters.append(
                     (
                         parameter_name,
@@ -956,25 +1121,10 @@ class TypeGenerator:
             self.add_str_to_types(indent, "@dataclasses.dataclass", 1)
             self.add_str_to_types(indent, f"class {self.get_name(event)}:", 1)
 
-            line, _ = self.__get_line_pos_from_byte_offset(
-                event.source_unit.file, event.byte_location[0]
+            self.__generate_attributes_docstring(event, parameters, indent + 1)
+            self.add_strs_to_types(
+                indent + 1, ("_abi = ", self.__get_abi_item_repr(event_abi)), 1
             )
-            self.add_str_to_types(indent + 1, '"""', 1)
-            self.add_str_to_types(
-                indent + 1,
-                f"[Source code]({_path_to_uri(event.source_unit.file)}#{line + 1})",
-                1 if len(parameters) == 0 else 2,
-            )
-
-            if len(parameters) > 0:
-                self.add_str_to_types(indent + 1, "Attributes:", 1)
-                for param_name, param_type, param_type_desc, _ in parameters:
-                    self.add_str_to_types(
-                        indent + 2, f"{param_name} ({param_type}): {param_type_desc}", 1
-                    )
-
-            self.add_str_to_types(indent + 1, '"""', 1)
-            self.add_str_to_types(indent + 1, f"_abi = {event_abi}", 1)
             self.add_str_to_types(
                 indent + 1,
                 "origin: Account = dataclasses.field(init=False, compare=False, repr=False)",
@@ -996,10 +1146,33 @@ class TypeGenerator:
     # parses the expr to string
     # optionaly generates an import
     def parse_type_and_import(self, expr: types.TypeAbc, return_types: bool) -> str:
-        if return_types:
-            types_index = 1
-        else:
-            types_index = 0
+        # imports and ListN types needed by the expr are already generated once it is cached
+        key = (expr, return_types)
+        if key not in self.__parsed_types:
+            self.__parsed_types[key] = self.__parse_type_and_import(expr, return_types)
+        return self.__parsed_types[key]
+
+    def __parse_leaf_type(
+        self, expr: types.TypeAbc, return_types: bool
+    ) -> Optional[str]:
+        # address, bool, string, bytes and function types map directly to a Python type
+        py_types = self.__sol_to_py_lookup.get(type(expr))
+        if py_types is not None:
+            return py_types[1] if return_types else py_types[0]
+
+        # most common types first
+        if isinstance(expr, types.UInt):
+            return f"uint{expr.bits_count}"
+        elif isinstance(expr, types.Int):
+            return f"int{expr.bits_count}"
+        elif isinstance(expr, types.FixedBytes):
+            return f"bytes{expr.bytes_count}"
+        return None
+
+    def __parse_type_and_import(self, expr: types.TypeAbc, return_types: bool) -> str:
+        leaf_type = self.__parse_leaf_type(expr, return_types)
+        if leaf_type is not None:
+            return leaf_type
 
         if isinstance(expr, types.Struct):
             parent = expr.ir_node.parent
@@ -1022,28 +1195,21 @@ class TypeGenerator:
                 expr.ir_node.underlying_type.type, return_types
             )
         elif isinstance(expr, types.Array):
+            base_type = self.parse_type_and_import(expr.base_type, return_types)
             if expr.length is None:
-                return (
-                    f"List[{self.parse_type_and_import(expr.base_type, return_types)}]"
-                )
+                return f"List[{base_type}]"
             elif expr.length <= 32:
-                return f"List{expr.length}[{self.parse_type_and_import(expr.base_type, return_types)}]"
+                return _LIST_PREFIXES[expr.length] + base_type + "]"
             else:
                 self.__fixed_size_arrays.add(expr.length)
-                return f"List{expr.length}[{self.parse_type_and_import(expr.base_type, return_types)}]"
+                return f"List{expr.length}[{base_type}]"
         elif isinstance(expr, types.Contract):
             self.__imports.generate_contract_import(expr.ir_node)
             return self.get_name(expr.ir_node)
-        elif isinstance(expr, types.FixedBytes):
-            return f"bytes{expr.bytes_count}"
-        elif isinstance(expr, types.Int):
-            return f"int{expr.bits_count}"
-        elif isinstance(expr, types.UInt):
-            return f"uint{expr.bits_count}"
         elif isinstance(expr, types.Mapping):
             return f"Dict[{self.parse_type_and_import(expr.key_type, return_types)}, {self.parse_type_and_import(expr.value_type, return_types)}]"
         else:
-            return self.__sol_to_py_lookup[expr.__class__.__name__][types_index]
+            raise NotImplementedError(f"Cannot generate pytypes for type {expr}")
 
     def generate_func_params(
         self, fn: FunctionDefinition
@@ -1076,8 +1242,7 @@ class TypeGenerator:
         ]
 
     def is_compound_type(self, var_type: types.TypeAbc):
-        name = var_type.__class__.__name__
-        return name == "Array" or name == "Mapping"
+        return isinstance(var_type, (types.Array, types.Mapping))
 
     def generate_getter_for_state_var(self, decl: VariableDeclaration):
         def get_struct_return_list(
@@ -1120,14 +1285,24 @@ class TypeGenerator:
         param_names: List[Tuple[str, str]] = []
         # if the type is compound we need to use the type as an index, for primitive types we use the
         # the type only for the return
-        # TODO reorder the elif chain such that the most common types are on the top
         def generate_getter_helper(
             var_type_name: TypeNameAbc, use_parse: bool, depth: int
         ) -> List[str]:
             nonlocal returns
             nonlocal param_names
-            parsed = []
             var_type = var_type_name.type
+
+            # most state variables and mapping keys/values are leaf types that need no imports
+            leaf_return_type = self.__parse_leaf_type(var_type, True)
+            if leaf_return_type is not None:
+                returns = [(leaf_return_type, var_type_name.type_string)]
+                if use_parse:
+                    leaf_type = self.__parse_leaf_type(var_type, False)
+                    assert leaf_type is not None
+                    return [leaf_type]
+                return []
+
+            parsed = []
             if isinstance(var_type, types.Struct):
                 if depth == 0:
                     pass
@@ -1184,14 +1359,10 @@ class TypeGenerator:
                         (f"uint{underlying_type.bits_count}", var_type_name.type_string)
                     ]
                 else:
-                    parsed.append(
-                        self.__sol_to_py_lookup[underlying_type.__class__.__name__][0]
-                    )
+                    parsed.append(self.__sol_to_py_lookup[type(underlying_type)][0])
                     returns = [
                         (
-                            self.__sol_to_py_lookup[underlying_type.__class__.__name__][
-                                1
-                            ],
+                            self.__sol_to_py_lookup[type(underlying_type)][1],
                             var_type_name.type_string,
                         )
                     ]
@@ -1236,86 +1407,97 @@ class TypeGenerator:
                 self.__imports.generate_contract_import(var_type.ir_node)
                 parsed.append(self.get_name(var_type.ir_node))
                 returns = [(self.get_name(var_type.ir_node), var_type_name.type_string)]
-            elif isinstance(var_type, types.FixedBytes):
-                parsed.append(f"bytes{var_type.bytes_count}")
-                returns = [(f"bytes{var_type.bytes_count}", var_type_name.type_string)]
-            elif isinstance(var_type, types.Int):
-                parsed.append(f"int{var_type.bits_count}")
-                returns = [(f"int{var_type.bits_count}", var_type_name.type_string)]
-            elif isinstance(var_type, types.UInt):
-                parsed.append(f"uint{var_type.bits_count}")
-                returns = [(f"uint{var_type.bits_count}", var_type_name.type_string)]
             else:
-                parsed.append(self.__sol_to_py_lookup[var_type.__class__.__name__][0])
-                returns = [
-                    (
-                        self.__sol_to_py_lookup[var_type.__class__.__name__][1],
-                        var_type_name.type_string,
-                    )
-                ]
+                raise NotImplementedError(
+                    f"Cannot generate pytypes for type {var_type}"
+                )
 
             return parsed if use_parse else []
 
         generated_params = generate_getter_helper(decl.type_name, False, 0)
 
-        if len(returns) == 0:
-            returns_str = "None"
-        elif len(returns) == 1:
-            returns_str = returns[0][0]
-        else:
-            returns_str = f"Tuple[{', '.join(ret[0] for ret in returns)}]"
+        returns_str = _format_returns(returns)
+
+        # shared by all overloads and the implementation
+        name = self.get_name(decl)
+        params_str = "".join(param + ", " for param in generated_params)
+        docstring = self.__generate_func_docstring(decl, param_names, returns)
 
         self.generate_type_hint_stub_func(
-            decl, generated_params, returns_str, "call", True, param_names, returns
+            name, params_str, docstring, returns_str, "call", True
         )
         self.generate_type_hint_stub_func(
-            decl, generated_params, "int", "estimate", False, param_names, returns
+            name, params_str, docstring, "int", "estimate", False
         )
         self.generate_type_hint_stub_func(
-            decl,
-            generated_params,
+            name,
+            params_str,
+            docstring,
             "Tuple[Dict[Address, List[int]], int]",
             "access_list",
             False,
-            param_names,
-            returns,
         )
         self.generate_type_hint_stub_func(
-            decl,
-            generated_params,
+            name,
+            params_str,
+            docstring,
             f"TransactionAbc[{returns_str}]",
             "tx",
             False,
-            param_names,
-            returns,
         )
 
         self.generate_func_implementation(
             decl,
-            generated_params,
+            name,
+            params_str,
+            docstring,
+            returns_str,
             param_names,
             returns,
         )
 
-    # receives names of params and their type hints, returns only the types to be used for dispatch
-    def get_types_from_func_params(self, params) -> str:
-        # 1. split on , to separete the params
-        # 2. split on : and get the last (the second) elem to get the type (each pair is in the format name: type)
-        # 3. remove the last elem which is params: Optional[TxParams] = None (not used for dispatch)
-        name_type = params.split(",")
-        types = []
-        for name_type_pair in name_type:
-            types.append(name_type_pair.split(":")[-1])
-        res: str = ", ".join(types[:-1])
-        if res:
-            # remove the first char which a redundant whitespace
-            res = res[1:]
-        return res
+    def __generate_func_docstring(
+        self,
+        declaration: Union[FunctionDefinition, VariableDeclaration],
+        param_names: List[Tuple[str, str]],
+        returns: List[Tuple[str, str]],
+    ) -> str:
+        line, _ = self.__get_line_pos_from_byte_offset(
+            declaration.source_unit.file, declaration.byte_location[0]
+        )
+        indent_str = _INDENTS[2]
+        arg_indent_str = _INDENTS[3]
+        doc_lines = [
+            indent_str + '"""',
+            f"{indent_str}[Source code]({_path_to_uri(declaration.source_unit.file)}#{line + 1})",
+        ]
+        if len(param_names) + len(returns) > 0:
+            doc_lines.append("")
+        if len(param_names) > 0:
+            doc_lines.append(indent_str + "Args:")
+            doc_lines.extend(
+                f"{arg_indent_str}{param_name}: {param_type}"
+                for param_name, param_type in param_names
+            )
+        if len(returns) == 1:
+            doc_lines.append(indent_str + "Returns:")
+            doc_lines.append(f"{arg_indent_str}{returns[0][1]}")
+        elif len(returns) > 1:
+            doc_lines.append(indent_str + "Returns:")
+            doc_lines.append(
+                f'{arg_indent_str}({", ".join(ret[1] for ret in returns)})'
+            )
+        doc_lines.append(indent_str + '"""')
+        doc_lines.append("")
+        return "\n".join(doc_lines)
 
     def generate_func_implementation(
         self,
         declaration: Union[FunctionDefinition, VariableDeclaration],
-        params: List[str],
+        name: str,
+        params_str: str,
+        docstring: str,
+        returns_str: str,
         param_names: List[Tuple[str, str]],
         returns: List[Tuple[str, str]],
     ):
@@ -1325,46 +1507,19 @@ class TypeGenerator:
             StateMutability.VIEW,
             StateMutability.PURE,
         }
-        params_str = "".join(param + ", " for param in params)
-        if len(returns) == 0:
-            returns_str = None
-        elif len(returns) == 1:
-            returns_str = returns[0][0]
-        else:
-            returns_str = f"Tuple[{', '.join(ret[0] for ret in returns)}]"
         self.add_str_to_types(
             1,
-            f"""def {self.get_name(declaration)}(self, {params_str}*, from_: Optional[Union[Account, Address, str]] = None, to: Optional[Union[Account, Address, str]] = None, value: Union[int, str] = 0, gas_limit: Optional[Union[int, Literal["max"], Literal["auto"]]] = None, request_type: RequestType = '{'call' if is_view_or_pure else 'tx'}', gas_price: Optional[Union[int, str]] = None, max_fee_per_gas: Optional[Union[int, str]] = None, max_priority_fee_per_gas: Optional[Union[int, str]] = None, access_list: Optional[Union[Dict[Union[Account, Address, str], List[int]], Literal["auto"]]] = None, type: Optional[int] = None, block: Optional[Union[int, Literal["latest"], Literal["pending"], Literal["earliest"], Literal["safe"], Literal["finalized"]]] = None, confirmations: Optional[int] = None) -> Union[{returns_str}, TransactionAbc[{returns_str}], int, Tuple[Dict[Address, List[int]], int]]:""",
+            _FUNCTION_SIGNATURE.format(
+                name=name,
+                params=params_str,
+                request_type=f"RequestType = '{'call' if is_view_or_pure else 'tx'}'",
+                returns=f"Union[{returns_str}, TransactionAbc[{returns_str}], int, Tuple[Dict[Address, List[int]], int]]",
+            ),
             1,
         )
+        self.__source_unit_types.append(docstring)
 
-        line, _ = self.__get_line_pos_from_byte_offset(
-            declaration.source_unit.file, declaration.byte_location[0]
-        )
-        self.add_str_to_types(2, '"""', 1)
-        self.add_str_to_types(
-            2,
-            f"[Source code]({_path_to_uri(declaration.source_unit.file)}#{line + 1})",
-            1 if len(param_names) + len(returns) == 0 else 2,
-        )
-        if len(param_names) > 0:
-            self.add_str_to_types(2, "Args:", 1)
-            for param_name, param_type in param_names:
-                self.add_str_to_types(3, f"{param_name}: {param_type}", 1)
-        if len(returns) == 1:
-            self.add_str_to_types(2, "Returns:", 1)
-            self.add_str_to_types(3, f"{returns[0][1]}", 1)
-        elif len(returns) > 1:
-            self.add_str_to_types(2, "Returns:", 1)
-            self.add_str_to_types(3, f'({", ".join(ret[1] for ret in returns)})', 1)
-        self.add_str_to_types(2, '"""', 1)
-
-        if len(returns) == 0:
-            return_types = "NoneType"
-        elif len(returns) == 1:
-            return_types = returns[0][0]
-        else:
-            return_types = f"Tuple[{', '.join(map(itemgetter(0), returns))}]"
+        return_types = returns_str if len(returns) > 0 else "NoneType"
 
         assert declaration.function_selector is not None
         fn_selector = declaration.function_selector.hex()
@@ -1376,107 +1531,97 @@ class TypeGenerator:
 
     def generate_type_hint_stub_func(
         self,
-        declaration: Union[FunctionDefinition, VariableDeclaration],
-        params: List[str],
+        name: str,
+        params_str: str,
+        docstring: str,
         returns_str: str,
         request_type: str,
         request_type_is_default: bool,
-        param_names: List[Tuple[str, str]],
-        returns: List[Tuple[str, str]],
     ):
-        params_str = "".join(param + ", " for param in params)
-
         self.add_str_to_types(1, "@overload", 1)
         self.add_str_to_types(
             1,
-            f"""def {self.get_name(declaration)}(self, {params_str}*, from_: Optional[Union[Account, Address, str]] = None, to: Optional[Union[Account, Address, str]] = None, value: Union[int, str] = 0, gas_limit: Optional[Union[int, Literal["max"], Literal["auto"]]] = None, request_type: Literal["{request_type}"]{' = "' + request_type + '"' if request_type_is_default else ''}, gas_price: Optional[Union[int, str]] = None, max_fee_per_gas: Optional[Union[int, str]] = None, max_priority_fee_per_gas: Optional[Union[int, str]] = None, access_list: Optional[Union[Dict[Union[Account, Address, str], List[int]], Literal["auto"]]] = None, type: Optional[int] = None, block: Optional[Union[int, Literal["latest"], Literal["pending"], Literal["earliest"], Literal["safe"], Literal["finalized"]]] = None, confirmations: Optional[int] = None) -> {returns_str}:""",
+            _FUNCTION_SIGNATURE.format(
+                name=name,
+                params=params_str,
+                request_type=f'Literal["{request_type}"]'
+                + (f' = "{request_type}"' if request_type_is_default else ""),
+                returns=returns_str,
+            ),
             1,
         )
-        line, _ = self.__get_line_pos_from_byte_offset(
-            declaration.source_unit.file, declaration.byte_location[0]
-        )
-        self.add_str_to_types(2, '"""', 1)
-        self.add_str_to_types(
-            2,
-            f"[Source code]({_path_to_uri(declaration.source_unit.file)}#{line + 1})",
-            1 if len(param_names) + len(returns) == 0 else 2,
-        )
-        if len(param_names) > 0:
-            self.add_str_to_types(2, "Args:", 1)
-            for param_name, param_type in param_names:
-                self.add_str_to_types(3, f"{param_name}: {param_type}", 1)
-        if len(returns) == 1:
-            self.add_str_to_types(2, "Returns:", 1)
-            self.add_str_to_types(3, f"{returns[0][1]}", 1)
-        elif len(returns) > 1:
-            self.add_str_to_types(2, "Returns:", 1)
-            self.add_str_to_types(3, f'({", ".join(ret[1] for ret in returns)})', 1)
-        self.add_str_to_types(2, '"""', 1)
+        self.__source_unit_types.append(docstring)
         self.add_str_to_types(2, "...", 2)
 
     def generate_types_function(self, fn: FunctionDefinition):
         params_names, params = self.generate_func_params(fn)
         returns = self.generate_func_returns(fn)
 
-        if len(returns) == 0:
-            returns_str = "None"
-        elif len(returns) == 1:
-            returns_str = returns[0][0]
-        else:
-            returns_str = f"Tuple[{', '.join(ret[0] for ret in returns)}]"
+        returns_str = _format_returns(returns)
 
         is_pure_or_view = fn.state_mutability in {
             StateMutability.PURE,
             StateMutability.VIEW,
         }
 
+        # shared by all overloads and the implementation
+        name = self.get_name(fn)
+        params_str = "".join(param + ", " for param in params)
+        docstring = self.__generate_func_docstring(fn, params_names, returns)
+
         self.generate_type_hint_stub_func(
-            fn,
-            params,
-            returns_str,
-            "call",
-            is_pure_or_view,
-            params_names,
-            returns,
+            name, params_str, docstring, returns_str, "call", is_pure_or_view
         )
         self.generate_type_hint_stub_func(
-            fn,
-            params,
-            "int",
-            "estimate",
-            False,
-            params_names,
-            returns,
+            name, params_str, docstring, "int", "estimate", False
         )
         self.generate_type_hint_stub_func(
-            fn,
-            params,
+            name,
+            params_str,
+            docstring,
             "Tuple[Dict[Address, List[int]], int]",
             "access_list",
             False,
-            params_names,
-            returns,
         )
         self.generate_type_hint_stub_func(
-            fn,
-            params,
+            name,
+            params_str,
+            docstring,
             f"TransactionAbc[{returns_str}]",
             "tx",
             not is_pure_or_view,
-            params_names,
-            returns,
         )
 
         assert fn.function_selector is not None
         self.generate_func_implementation(
             fn,
-            params,
+            name,
+            params_str,
+            docstring,
+            returns_str,
             params_names,
             returns,
         )
 
     def generate_types_contract(self, contract: ContractDefinition) -> None:
-        fqn = f"{contract.parent.source_unit_name}:{contract.name}"
+        # base contracts from the same source unit are generated on an explicit stack
+        # instead of recursively, in the same order
+        stack = [self._emit_contract_body(contract)]
+        while len(stack) > 0:
+            try:
+                parent_contract = next(stack[-1])
+            except StopIteration:
+                stack.pop()
+            else:
+                stack.append(self._emit_contract_body(parent_contract))
+
+    def _emit_contract_body(
+        self, contract: ContractDefinition
+    ) -> Iterator[ContractDefinition]:
+        """
+        Yields base contracts from the same source unit that must be generated before the rest of the contract.
+        """
+        fqn = _get_fqn(contract)
         if fqn in self.__already_generated_contracts:
             return
         else:
@@ -1493,15 +1638,13 @@ class TypeGenerator:
                 == contract.parent.source_unit_name
             ):
                 base_names.append(self.get_name(parent_contract))
-                self.generate_types_contract(parent_contract)
+                yield parent_contract
             # contract is not in the same source unit, so it must be imported
             else:
                 base_names.append(self.get_name(parent_contract, force_simple=True))
                 self.__imports.generate_contract_import(parent_contract, force=True)
 
-        contract_module_name = "pytypes." + _make_path_alphanum(
-            contract.parent.source_unit_name[:-3]
-        ).replace("/", ".")
+        contract_module_name = _get_module_name(contract.parent.source_unit_name)
         self.__contracts_index[fqn] = (
             contract_module_name,
             (self.get_name(contract),),
@@ -1580,94 +1723,25 @@ class TypeGenerator:
         for a in self.__fixed_size_arrays:
             lists += f"class List{a}(FixedSizeList[T]):\n    length = {a}\n\n\n"
 
-        self.__pytypes_dir.mkdir(exist_ok=True)
         contract_name = _make_path_alphanum(contract_name[:-3])
         unit_path = (self.__pytypes_dir / contract_name).with_suffix(".py")
+        # also creates the pytypes directory
         unit_path.parent.mkdir(parents=True, exist_ok=True)
-        unit_path.write_text(str(self.__imports) + lists + self.__source_unit_types)
+        # imports are only known after all types are generated, so they cannot be streamed
+        # write the generated chunks directly instead of joining them into one string
+        # a large buffer turns the many small chunks into a few write syscalls
+        with unit_path.open("w", buffering=1 << 20) as f:
+            f.write(str(self.__imports))
+            f.write(lists)
+            f.writelines(self.__source_unit_types)
 
     # clean the instance variables to enable generating a new source unit
     def cleanup_source_unit(self):
-        self.__source_unit_types = ""
+        self.__source_unit_types.clear()
         self.__imports.cleanup_imports()
         self.__fixed_size_arrays.clear()
-
-    def add_func_overload_if_match(
-        self, fn: FunctionDefinition, contract: ContractDefinition
-    ):
-        for function in contract.functions:
-            # this function is called also with the contract in which the function is defined
-            # thus we need to ensure that we don't compare the function with itself
-            if (
-                fn.name == function.name and fn != function
-            ):  # and len(fn.parameters.parameters) == len(function.parameters.parameters):
-                # both functions have to be overloded -> add both
-                if isinstance(fn.parent, ContractDefinition):
-                    source_unit = fn.parent.parent
-                else:
-                    source_unit = fn.parent
-                # there can be 2 contracts with the same name and both of them can define function with the same name
-                # thus to uniquely idenify the funtion also the source unit has to be used, otherwise it could happen
-                # that an incorrect function gets overloaded
-                self.__func_to_overload.add(
-                    source_unit.source_unit_name + fn.canonical_name
-                )
-                self.__func_to_overload.add(
-                    contract.parent.source_unit_name + function.canonical_name
-                )
-                # print("-------------------")
-                # print(f"overload: {fn.canonical_name} {fn.parent.canonical_name}")
-                # print(f"overload: {function.canonical_name} {contract.canonical_name}")
-                # print("-------------------")
-
-    # TODO add check if func not in __func_to_overload for optimization
-    def traverse_funcs_in_child_contracts(
-        self, fn: FunctionDefinition, contract: ContractDefinition
-    ):
-        for child in contract.child_contracts:
-            self.add_func_overload_if_match(fn, child)
-
-        for child in contract.child_contracts:
-            self.traverse_funcs_in_child_contracts(fn, child)
-
-    # TODO add check if func not in __func_to_overload
-    def traverse_funcs_in_parent_contracts(
-        self, fn: FunctionDefinition, contract: ContractDefinition
-    ):
-        for inh_spec in contract.base_contracts:
-            if not contract.kind == ContractKind.INTERFACE:
-                parent_contract = inh_spec.base_name.referenced_declaration
-                assert isinstance(parent_contract, ContractDefinition)
-                self.add_func_overload_if_match(fn, parent_contract)
-        for inh_spec in contract.base_contracts:
-            if not contract.kind == ContractKind.INTERFACE:
-                parent_contract = inh_spec.base_name.referenced_declaration
-                assert isinstance(parent_contract, ContractDefinition)
-                self.traverse_funcs_in_parent_contracts(fn, parent_contract)
-
-    # TODO travesrse also state variables as getters are generated for them and thus overlaoding might be necessary
-    def traverse_funcs_to_check_overload(self):
-        # set containing canonical names of functions to be overloaded
-        for _, unit in self.__source_units.items():
-            for contract in unit.contracts:
-                # interface function can't have implementation and thus can't be overloaded
-                if contract.kind != ContractKind.INTERFACE:
-                    for fn in contract.functions:
-                        if (
-                            not fn.canonical_name in self.__func_to_overload
-                            and fn.implemented
-                            and fn.function_selector
-                        ):
-                            # we create pytypes only for functions that are publicly accessible
-                            if (
-                                fn.visibility == Visibility.PUBLIC
-                                or fn.visibility == Visibility.EXTERNAL
-                            ):
-                                self.add_func_overload_if_match(fn, contract)
-                                self.traverse_funcs_in_parent_contracts(fn, contract)
-                                self.traverse_funcs_in_child_contracts(fn, contract)
-            # if unit.source_unit_name == "overloading.sol":
-            #    print(self.__func_to_overload)
+        self.__parsed_types.clear()
+        self.__names.clear()
 
     def generate_types(self, compiler: SolidityCompiler) -> None:
         def generate_source_unit(source_unit: SourceUnit) -> None:
@@ -1682,6 +1756,12 @@ class TypeGenerator:
         self.__interval_trees = build.interval_trees
         self.__source_units = build.source_units
         self.__reference_resolver = build.reference_resolver
+        self.__libraries_by_id = {
+            self.get_library_id(_get_fqn(c)): c
+            for source_unit in self.__source_units.values()
+            for c in source_unit.contracts
+            if c.kind == ContractKind.LIBRARY
+        }
 
         self.clean_type_dir()
 
@@ -1698,91 +1778,85 @@ class TypeGenerator:
             paths_to_source_unit_names[path].add(source_unit)
 
         previous_len = len(graph)
-        cycles_detected = False
         cycles: Set[FrozenSet[str]] = set()
         generated_paths: Set[Path] = set()
 
+        # in-degrees are kept in sync with the graph instead of being recomputed for all nodes
+        in_degrees: Dict[str, int] = dict(
+            graph.in_degree()  # pyright: ignore reportGeneralTypeIssues
+        )
+        # use heapq to make order of source units deterministic
+        sources: List[str] = [
+            node for node, in_degree in in_degrees.items() if in_degree == 0
+        ]
+        heapq.heapify(sources)
+
+        def remove_path(path: Path) -> None:
+            # source units with all import dependencies generated become new sources
+            source_unit_names = paths_to_source_unit_names[path]
+            for source_unit_name in source_unit_names:
+                if source_unit_name not in graph:
+                    continue
+                for to in graph.successors(
+                    source_unit_name  # pyright: ignore reportGeneralTypeIssues
+                ):
+                    if to in source_unit_names:
+                        continue
+                    in_degrees[to] -= 1
+                    if in_degrees[to] == 0:
+                        heapq.heappush(sources, to)
+            graph.remove_nodes_from(source_unit_names)
+
+        def generate_path(path: Path) -> None:
+            if path not in generated_paths:
+                source_unit = self.__source_units.get(path)
+                if source_unit is not None:
+                    generate_source_unit(source_unit)
+                    generated_paths.add(path)
+            remove_path(path)
+
         # keep generating pytypes for source units that have all import dependencies already generated
         # take into account cyclic imports - generate pytypes for a cycle if all not yet generated import dependencies are in the cycle
         while len(graph) > 0:
-            # use heapq to make order of source units deterministic
-            sources: List[str] = [
-                node
-                for node, in_degree in graph.in_degree()  # pyright: ignore reportGeneralTypeIssues
-                if in_degree == 0
-            ]
-            heapq.heapify(sources)
-            visited: Set[str] = set(sources)
-
             while len(sources) > 0:
                 source = heapq.heappop(sources)
-                path = source_units_to_paths[source]
-                if path in self.__source_units and path not in generated_paths:
-                    generate_source_unit(self.__source_units[path])
-                    generated_paths.add(path)
-
-                for source_unit_name in paths_to_source_unit_names[path]:
-                    visited.add(source_unit_name)
-                    for (
-                        _,
-                        to,
-                    ) in graph.out_edges(  # pyright: ignore reportGeneralTypeIssues
-                        source_unit_name  # pyright: ignore reportGeneralTypeIssues
-                    ):
-                        if (
-                            graph.in_degree(
-                                to  # pyright: ignore reportGeneralTypeIssues
-                            )
-                            == 1
-                        ):
-                            heapq.heappush(sources, to)
-                            visited.add(to)
-                graph.remove_nodes_from(paths_to_source_unit_names[path])
-
-            generated_cycles: Set[FrozenSet[str]] = set()
-            simple_cycles = [set(c) for c in nx.simple_cycles(graph)]
-            if len(simple_cycles) > 0:
+                generate_path(source_units_to_paths[source])
+
+            # every strongly connected component with more than one source unit (or a self-import) is a cycle
+            # a cycle can be generated once it does not import any not yet generated source unit from outside
+            generated_cycles: List[FrozenSet[str]] = []
+            for component in nx.strongly_connected_components(graph):
+                if len(component) == 1:
+                    node = next(iter(component))
+                    if not graph.has_edge(node, node):
+                        continue
+
+                cycle = frozenset(component)
                 # used for reporting to user
-                cycles_detected = True
-                cycles.update([frozenset(c) for c in simple_cycles])
+                cycles.add(cycle)
 
-            for simple_cycle in simple_cycles:
-                if any(simple_cycle.issubset(c) for c in generated_cycles):
-                    # source units in this cycle were already marked to be generated
-                    continue
-
-                # merge with as many other cycles as possible (create transitive closure)
-                for other_cycle in simple_cycles:
-                    if len(simple_cycle & other_cycle) > 0:
-                        simple_cycle |= other_cycle
-
-                is_closed_cycle = True
-                for node in simple_cycle:
-                    if any(
-                        edge[0] not in simple_cycle
-                        for edge in graph.in_edges(
+                # closed cycle - all not yet generated dependencies of the cycle are in the cycle
+                if not all(
+                    cycle.issuperset(
+                        graph.predecessors(
                             node  # pyright: ignore reportGeneralTypeIssues
                         )
-                    ):
-                        is_closed_cycle = False
-                        break
+                    )
+                    for node in cycle
+                ):
+                    continue
 
-                if is_closed_cycle:
-                    generated_cycles.add(frozenset(simple_cycle))
+                generated_cycles.append(cycle)
 
-                    # update cyclic source units index used when generating pytypes
-                    for source_unit_name in simple_cycle:
-                        self.__cyclic_source_units[source_unit_name].update(
-                            s for s in simple_cycle if s != source_unit_name
-                        )
+                # update cyclic source units index used when generating pytypes
+                for source_unit_name in cycle:
+                    cyclic_source_units = self.__cyclic_source_units[source_unit_name]
+                    cyclic_source_units.update(cycle)
+                    cyclic_source_units.discard(source_unit_name)
 
-            for cycle in sorted(generated_cycles):
+            for cycle in sorted(map(sorted, generated_cycles)):
                 for source in cycle:
-                    path = source_units_to_paths[source]
-                    if path in self.__source_units and path not in generated_paths:
-                        generate_source_unit(self.__source_units[path])
-                        generated_paths.add(path)
-                    graph.remove_nodes_from(paths_to_source_unit_names[path])
+                    generate_path(source_units_to_paths[source])
 
             if len(graph) == previous_len:
                 # avoid infinite loop
@@ -1790,7 +1864,7 @@ class TypeGenerator:
                 break
             previous_len = len(graph)
 
-        if cycles_detected:
+        if len(cycles) > 0:
             logger.info(
                 "Cyclic imports detected\n"
                 + "\n".join(str(set(cycle)) for cycle in cycles)
@@ -1806,8 +1880,8 @@ class TypeGenerator:
         init_path.write_text(
             INIT_CONTENT.format(
                 version=get_package_version("eth-wake"),
-                errors=self.__errors_index,
-                events=self.__events_index,
+                errors=dict(self.__errors_index),
+                events=dict(self.__events_index),
                 contracts_by_fqn=self.__contracts_index,
                 contracts_by_metadata=self.__contracts_by_metadata_index,
                 contracts_inheritance=self.__contracts_inheritance_index,
@@ -1820,26 +1894,31 @@ class TypeGenerator:
 
 
 class SourceUnitImports:
-    __all_imports: str
+    __all_imports: List[str]
     __struct_imports: Set[str]
     __enum_imports: Set[str]
     __contract_imports: Set[str]
     __python_imports: Set[str]
     __type_checking_imports: Set[str]
     __lazy_modules: Set[str]
+    # (declaration, force) already processed in the current source unit, repeated calls are no-ops
+    __processed_declarations: Set[Tuple[DeclarationAbc, bool]]
     __type_gen: TypeGenerator
 
     def __init__(self, outer: TypeGenerator):
         self.__struct_imports = set()
         self.__enum_imports = set()
-        self.__all_imports = ""
+        self.__all_imports = []
         self.__contract_imports = set()
         self.__python_imports = set()
         self.__type_checking_imports = set()
         self.__lazy_modules = set()
+        self.__processed_declarations = set()
         self.__type_gen = outer
 
     def __str__(self) -> str:
+        # chunks are rebuilt on every call, so converting twice does not duplicate imports
+        self.__all_imports.clear()
         self.__add_str_to_imports(0, DEFAULT_IMPORTS, 1)
 
         for python_import in sorted(self.__python_imports):
@@ -1882,7 +1961,7 @@ class SourceUnitImports:
 
         self.__add_str_to_imports(0, "", 2)
 
-        return self.__all_imports
+        return "".join(self.__all_imports)
 
     def cleanup_imports(self) -> None:
         self.__struct_imports.clear()
@@ -1891,7 +1970,8 @@ class SourceUnitImports:
         self.__python_imports.clear()
         self.__type_checking_imports.clear()
         self.__lazy_modules.clear()
-        self.__all_imports = ""
+        self.__processed_declarations.clear()
+        self.__all_imports.clear()
 
     def __generate_import(
         self,
@@ -1900,30 +1980,42 @@ class SourceUnitImports:
         *,
         aliased: bool = False,
     ) -> str:
-        source_unit_name = _make_path_alphanum(source_unit_name)
+        module_name = _get_module_name(source_unit_name)
         name = self.__type_gen.get_name(declaration, force_simple=True)
 
         if aliased:
-            return f"import pytypes.{source_unit_name[:-3].replace('/', '.')} as {name}"
-        return f"from pytypes.{source_unit_name[:-3].replace('/', '.')} import {name}"
+            return f"import {module_name} as {name}"
+        return f"from {module_name} import {name}"
 
     def __generate_lazy_module(
         self, declaration: DeclarationAbc, source_unit_name: str
     ) -> str:
-        source_unit_name = _make_path_alphanum(source_unit_name)
+        module_name = _get_module_name(source_unit_name)
         name = self.__type_gen.get_name(declaration, force_simple=True)
 
-        return f"{name} = lazy_import.lazy_module('pytypes.{source_unit_name[:-3].replace('/', '.')}')"
+        return f"{name} = lazy_import.lazy_module('{module_name}')"
 
     def __add_str_to_imports(
         self, num_of_indentation: int, string: str, num_of_newlines: int
     ):
-        self.__all_imports += (
-            num_of_indentation * TAB_WIDTH * " " + string + num_of_newlines * "\n"
+        self.__all_imports.append(
+            _INDENTS[num_of_indentation] + string + _NEWLINES[num_of_newlines]
         )
 
+    def __check_and_mark_processed(
+        self, declaration: DeclarationAbc, force: bool = False
+    ) -> bool:
+        # returns True if the import was already generated for the current source unit
+        key = (declaration, force)
+        if key in self.__processed_declarations:
+            return True
+        self.__processed_declarations.add(key)
+        return False
+
     def generate_struct_import(self, struct_type: types.Struct):
         node = struct_type.ir_node
+        if self.__check_and_mark_processed(node):
+            return
         if isinstance(node.parent, ContractDefinition):
             source_unit = node.parent.parent
         else:
@@ -1950,6 +2042,8 @@ class SourceUnitImports:
 
     # only used for top-level enums (not within contracts)
     def generate_enum_import(self, enum_type: types.Enum):
+        if self.__check_and_mark_processed(enum_type.ir_node):
+            return
         source_unit = enum_type.ir_node.parent
         assert isinstance(source_unit, SourceUnit)
 
@@ -1976,6 +2070,9 @@ class SourceUnitImports:
     def generate_contract_import(
         self, contract: ContractDefinition, *, force: bool = False
     ):
+        # repeated calls with the same force add nothing new, see the branches below
+        if self.__check_and_mark_processed(contract, force):
+            return
         source_unit = contract.parent
         if source_unit.source_unit_name == self.__type_gen.current_source_unit:
             return
@@ -2011,13 +2108,23 @@ class NameSanitizer:
     __error_reserved: Set[str]
     __enum_reserved: Set[str]
 
-    __global_renames: Dict[DeclarationAbc, str]
-    __contract_renames: DefaultDict[ContractDefinition, Dict[DeclarationAbc, str]]
-    __function_renames: DefaultDict[FunctionDefinition, Dict[DeclarationAbc, str]]
-    __struct_renames: DefaultDict[StructDefinition, Dict[DeclarationAbc, str]]
-    __event_renames: DefaultDict[EventDefinition, Dict[DeclarationAbc, str]]
-    __error_renames: DefaultDict[ErrorDefinition, Dict[DeclarationAbc, str]]
-    __enum_renames: DefaultDict[EnumDefinition, Dict[DeclarationAbc, str]]
+    # declaration -> sanitized name, entries of global declarations are dropped in clear_global_renames
+    __sanitized_names: Dict[DeclarationAbc, str]
+    __global_declarations: List[DeclarationAbc]
+
+    # names already assigned in each scope
+    __global_names: Set[str]
+    # contract names are tracked together with declarations, see _check_contract
+    __contract_names: DefaultDict[
+        ContractDefinition, DefaultDict[str, List[DeclarationAbc]]
+    ]
+    # function, struct, event, error and enum scopes
+    __scope_names: DefaultDict[DeclarationAbc, Set[str]]
+
+    # parent type -> (check, names) of the scope of its child declarations
+    __scopes: Dict[
+        type, Callable[..., Tuple[Callable[[str], bool], Optional[Set[str]]]]
+    ]
 
     def __init__(self):
         self.__global_reserved = {
@@ -2068,6 +2175,9 @@ class NameSanitizer:
             self.__global_reserved.add(f"bytes{i}")
             self.__global_reserved.add(f"List{i}")
 
+        # every scope checks the global reserved names first
+        self.__global_reserved.update(keyword.kwlist)
+
         self.__contract_reserved = {
             "_abi",
             "_creation_code",
@@ -2114,27 +2224,36 @@ class NameSanitizer:
         self.__error_reserved = {"_abi", "selector", "original_name"}
         self.__enum_reserved = set()
 
-        self.__global_renames = {}
-        self.__contract_renames = defaultdict(dict)
-        self.__function_renames = defaultdict(dict)
-        self.__struct_renames = defaultdict(dict)
-        self.__event_renames = defaultdict(dict)
-        self.__error_renames = defaultdict(dict)
-        self.__enum_renames = defaultdict(dict)
+        self.__sanitized_names = {}
+        self.__global_declarations = []
 
-    def _check_global(self, name: str) -> bool:
+        self.__global_names = set()
+        self.__contract_names = defaultdict(lambda: defaultdict(list))
+        self.__scope_names = defaultdict(set)
+
+        self.__scopes = {
+            SourceUnit: self.__global_scope,
+            ContractDefinition: self.__contract_scope,
+            StructDefinition: self.__struct_scope,
+            EnumDefinition: self.__enum_scope,
+            ParameterList: self.__parameter_list_scope,
+        }
+
+    @staticmethod
+    def _is_dunder(name: str) -> bool:
         return (
-            name in self.__global_reserved
-            or name in set(self.__global_renames.values())
-            or keyword.iskeyword(name)
+            name.startswith("__") and name.endswith("__") and not name.endswith("___")
         )
 
+    def _check_global(self, name: str) -> bool:
+        return name in self.__global_reserved or name in self.__global_names
+
     def _check_contract(
         self, name: str, selector: Optional[bytes], contract: ContractDefinition
     ) -> bool:
         occupied = False
         for c in contract.linearized_base_contracts:
-            same_name = [k for k, v in self.__contract_renames[c].items() if v == name]
+            same_name = self.__contract_names[c].get(name, ())
             if selector is None and len(same_name) > 0:
                 occupied = True
             else:
@@ -2156,123 +2275,102 @@ class NameSanitizer:
 
         return (
             name in self.__global_reserved
-            or name in set(self.__global_renames)
             or name in self.__contract_reserved
             or occupied
-            or keyword.iskeyword(name)
-            or (
-                name.startswith("__")
-                and name.endswith("__")
-                and not name.endswith("___")
-            )
+            or self._is_dunder(name)
         )
 
     def _check_function(self, name: str, function: FunctionDefinition) -> bool:
         return (
             name in self.__global_reserved
-            or name in set(self.__global_renames)
             or name in self.__function_reserved
-            or name in set(self.__function_renames[function].values())
-            or keyword.iskeyword(name)
+            or name in self.__scope_names[function]
         )
 
     def _check_struct(self, name: str, struct: StructDefinition) -> bool:
         return (
             name in self.__global_reserved
-            or name in set(self.__global_renames)
             or name in self.__struct_reserved
-            or name in set(self.__struct_renames[struct].values())
-            or keyword.iskeyword(name)
-            or (
-                name.startswith("__")
-                and name.endswith("__")
-                and not name.endswith("___")
-            )
+            or name in self.__scope_names[struct]
+            or self._is_dunder(name)
         )
 
     def _check_event(self, name: str, event: EventDefinition) -> bool:
         return (
             name in self.__global_reserved
-            or name in set(self.__global_renames)
             or name in self.__event_reserved
-            or name in set(self.__event_renames[event].values())
-            or keyword.iskeyword(name)
-            or (
-                name.startswith("__")
-                and name.endswith("__")
-                and not name.endswith("___")
-            )
+            or name in self.__scope_names[event]
+            or self._is_dunder(name)
         )
 
     def _check_error(self, name: str, error: ErrorDefinition) -> bool:
         return (
             name in self.__global_reserved
-            or name in set(self.__global_renames)
             or name in self.__error_reserved
-            or name in set(self.__error_renames[error].values())
-            or keyword.iskeyword(name)
-            or (
-                name.startswith("__")
-                and name.endswith("__")
-                and not name.endswith("___")
-            )
+            or name in self.__scope_names[error]
+            or self._is_dunder(name)
         )
 
     def _check_enum(self, name: str, enum: EnumDefinition) -> bool:
         return (
             name in self.__global_reserved
-            or name in set(self.__global_renames)
             or name in self.__enum_reserved
-            or name in set(self.__enum_renames[enum].values())
-            or keyword.iskeyword(name)
-            or (
-                name.startswith("__")
-                and name.endswith("__")
-                and not name.endswith("___")
-            )
+            or name in self.__scope_names[enum]
+            or self._is_dunder(name)
         )
 
     def clear_global_renames(self):
-        self.__global_renames = {}
+        for declaration in self.__global_declarations:
+            del self.__sanitized_names[declaration]
+        self.__global_declarations = []
+        self.__global_names = set()
+
+    def __global_scope(self, declaration: DeclarationAbc, parent: SourceUnit):
+        return self._check_global, self.__global_names
+
+    def __contract_scope(self, declaration: DeclarationAbc, parent: ContractDefinition):
+        check = lambda name: self._check_contract(
+            name, getattr(declaration, "function_selector", None), parent
+        )
+        return check, None
+
+    def __struct_scope(self, declaration: DeclarationAbc, parent: StructDefinition):
+        check = lambda name: self._check_struct(name, parent)
+        return check, self.__scope_names[parent]
+
+    def __enum_scope(self, declaration: DeclarationAbc, parent: EnumDefinition):
+        check = lambda name: self._check_enum(name, parent)
+        return check, self.__scope_names[parent]
+
+    def __parameter_list_scope(
+        self, declaration: DeclarationAbc, parent: ParameterList
+    ):
+        parent_parent = parent.parent
+        if type(parent_parent) is FunctionDefinition:
+            check = lambda name: self._check_function(name, parent_parent)
+            return check, self.__scope_names[parent_parent]
+        elif type(parent_parent) is EventDefinition:
+            check = lambda name: self._check_event(name, parent_parent)
+            return check, self.__scope_names[parent_parent]
+        elif type(parent_parent) is ErrorDefinition:
+            check = lambda name: self._check_error(name, parent_parent)
+            return check, self.__scope_names[parent_parent]
+        raise NotImplementedError(
+            f"Cannot sanitize name for declaration {declaration} with parent {parent} and parent of parent {parent_parent}"
+        )
 
     def sanitize_name(self, declaration: DeclarationAbc) -> str:
+        if declaration in self.__sanitized_names:
+            return self.__sanitized_names[declaration]
+
         parent = declaration.parent
-        if isinstance(parent, SourceUnit):
-            check = self._check_global
-            renames = self.__global_renames
-        elif isinstance(parent, ContractDefinition):
-            check = lambda name: self._check_contract(
-                name, getattr(declaration, "function_selector", None), parent
-            )
-            renames = self.__contract_renames[parent]
-        elif isinstance(parent, StructDefinition):
-            check = lambda name: self._check_struct(name, parent)
-            renames = self.__struct_renames[parent]
-        elif isinstance(parent, EnumDefinition):
-            check = lambda name: self._check_enum(name, parent)
-            renames = self.__enum_renames[parent]
-        elif isinstance(parent, ParameterList):
-            parent_parent = parent.parent
-            if isinstance(parent_parent, FunctionDefinition):
-                check = lambda name: self._check_function(name, parent_parent)
-                renames = self.__function_renames[parent_parent]
-            elif isinstance(parent_parent, EventDefinition):
-                check = lambda name: self._check_event(name, parent_parent)
-                renames = self.__event_renames[parent_parent]
-            elif isinstance(parent_parent, ErrorDefinition):
-                check = lambda name: self._check_error(name, parent_parent)
-                renames = self.__error_renames[parent_parent]
-            else:
-                raise NotImplementedError(
-                    f"Cannot sanitize name for declaration {declaration} with parent {parent} and parent of parent {parent_parent}"
-                )
-        else:
+        # dispatch on the exact parent type instead of an isinstance chain
+        scope = self.__scopes.get(type(parent))
+        if scope is None:
             raise NotImplementedError(
                 f"Cannot sanitize name for declaration {declaration} with parent {parent}"
             )
-
-        if declaration in renames:
-            return renames[declaration]
+        check, names = scope(declaration, parent)
 
         new_name = declaration.name.replace("$", "_")
         while new_name.startswith("__"):
@@ -2281,5 +2379,12 @@ class NameSanitizer:
         while check(new_name):
             new_name = new_name + "_"
 
-        renames[declaration] = new_name
+        self.__sanitized_names[declaration] = new_name
+        if names is not None:
+            names.add(new_name)
+        else:
+            assert isinstance(parent, ContractDefinition)
+            self.__contract_names[parent][new_name].append(declaration)
+        if isinstance(parent, SourceUnit):
+            self.__global_declarations.append(declaration)
         return new_name
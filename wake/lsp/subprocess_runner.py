@@ -504,9 +504,12 @@ def run_printers_subprocess(
                 args=(
                     [
                         (package, repr(e))
-                        for package, e in run_print.failed_plugin_entry_points
+                        for package, e in run_print.failed_plugin_entry_points.items()
+                    ],
+                    [
+                        (path, repr(e))
+                        for path, e in run_print.failed_plugin_paths.items()
                     ],
-                    [(path, repr(e)) for path, e in run_print.failed_plugin_paths],
                     out_queue,
                     config,
                     run_printers_command_ids[-1],
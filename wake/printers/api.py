@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from abc import ABCMeta, abstractmethod
-from functools import partial
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
@@ -39,6 +39,12 @@ if TYPE_CHECKING:
     from wake.core.lsp_provider import LspProvider
 
 
+@lru_cache(maxsize=256)
+def _get_printer_logger(name: str) -> logging.Logger:
+    # logger levels are kept in sync by set_debug, no need to look the logger up on every run
+    return get_logger(name)
+
+
 class Printer(Visitor, metaclass=ABCMeta):
     """
     Base class for printers.
@@ -47,6 +53,8 @@ class Printer(Visitor, metaclass=ABCMeta):
         paths: Paths the printer should operate on. May be empty if a user did not specify any paths, e.g. when running `wake print printer-name`.
             In this case, the printer should operate on all paths. May be ignored unless [visit_mode][wake.printers.api.Printer.visit_mode] is `all`.
         extra: Extra data set by the execution engine.
+        mutates_graph: Whether the printer may modify the [imports_graph][wake.core.visitor.Visitor.imports_graph]. If `True` (default), the printer receives its own copy.
+            Printers that only read the graph may set this to `False` to share it without copying.
     """
 
     console: Console
@@ -54,6 +62,7 @@ class Printer(Visitor, metaclass=ABCMeta):
     extra: Dict[Any, Any]
     lsp_provider: Optional[LspProvider]
     execution_mode: Literal["cli", "lsp", "both"] = "cli"  # TODO remove both?
+    mutates_graph: bool = True
 
     @property
     def visit_mode(self) -> Literal["paths", "all"]:
@@ -268,24 +277,6 @@ def run_printers(
             command.callback
         )  # pyright: ignore reportGeneralTypeIssues
         if cls is not None:
-
-            def _callback(  # pyright: ignore reportGeneralTypeIssues
-                printer_name: str, *args, **kwargs
-            ):
-                nonlocal paths
-                if paths is None:
-                    paths = [Path(p).resolve() for p in kwargs.pop("paths", [])]
-                else:
-                    kwargs.pop("paths", None)
-
-                instance.paths = [Path(p).resolve() for p in paths]
-                original_callback(
-                    instance, *args, **kwargs
-                )  # pyright: ignore reportOptionalCall
-
-            original_callback = command.callback
-            command.callback = partial(_callback, command.name)
-
             if lsp_provider is not None and cls.execution_mode == "cli":
                 printers.remove(command)
                 continue
@@ -301,10 +292,10 @@ def run_printers(
                 instance.extra = extra
                 instance.console = console
                 instance.imports_graph = (
-                    imports_graph.copy()
+                    imports_graph.copy() if cls.mutates_graph else imports_graph
                 )  # pyright: ignore reportGeneralTypeIssues
                 instance.lsp_provider = lsp_provider
-                instance.logger = get_logger(cls.__name__)
+                instance.logger = _get_printer_logger(cls.__name__)
                 if logging_handler is not None:
                     instance.logger.addHandler(logging_handler)
 
@@ -318,7 +309,28 @@ def run_printers(
                         default_map=default_map,
                     )
                     with sub_ctx:
-                        sub_ctx.command.invoke(sub_ctx)
+                        kwargs = dict(sub_ctx.params)
+                        if paths is None:
+                            paths = [Path(p).resolve() for p in kwargs.pop("paths", [])]
+                        else:
+                            kwargs.pop("paths", None)
+
+                        instance.paths = [Path(p).resolve() for p in paths]
+                        # Command.invoke cannot pass the printer instance, replicate its deprecation notice
+                        if command.deprecated:
+                            click.echo(
+                                click.style(
+                                    f"DeprecationWarning: The command {command.name!r} is deprecated.",
+                                    fg="red",
+                                ),
+                                err=True,
+                            )
+                        # Context.invoke attaches the context to usage errors raised by the callback
+                        sub_ctx.invoke(
+                            command.callback,  # pyright: ignore reportGeneralTypeIssues
+                            instance,
+                            **kwargs,
+                        )
 
                     collected_printers[command.name] = instance
                     if instance.visit_mode == "all":
@@ -331,8 +343,6 @@ def run_printers(
                 if not capture_exceptions:
                     raise
                 exceptions[command.name] = e
-            finally:
-                command.callback = original_callback
         else:
             if lsp_provider is not None:
                 printers.remove(command)
@@ -367,7 +377,7 @@ def run_printers(
                     "config": config,
                     "extra": extra,
                     "imports_graph": imports_graph.copy(),
-                    "logger": get_logger(original_callback.__name__),
+                    "logger": _get_printer_logger(original_callback.__name__),
                     "console": console,
                     # no need to set lsp_provider as legacy printers are not executed by the LSP server
                 }
@@ -1,5 +1,29 @@
 import functools
 import inspect
+import weakref
+
+# function -> weak reference to the class that defined it; weak on both sides so that
+# neither the function nor the class is kept alive by the cache
+_defining_classes = weakref.WeakKeyDictionary()
+
+
+def _get_class_that_defined_function(func):
+    ref = _defining_classes.get(func)
+    if ref is not None:
+        c = ref()
+        if c is not None:
+            return c
+
+    c = getattr(
+        inspect.getmodule(func),
+        func.__qualname__.split(".<locals>", 1)[0].rsplit(".", 1)[0],
+        None,
+    )
+    if isinstance(c, type):
+        # misses are not cached, the class may not be defined yet
+        _defining_classes[func] = weakref.ref(c)
+        return c
+    return None
 
 
 # credits: https://stackoverflow.com/questions/3589311/get-defining-class-of-unbound-method-object-in-python-3/25959545#25959545
@@ -12,11 +36,8 @@ def get_class_that_defined_method(meth):
                 return c
         meth = getattr(meth, "__func__", meth)  # fallback to __qualname__ parsing
     if inspect.isfunction(meth):
-        c = getattr(
-            inspect.getmodule(meth),
-            meth.__qualname__.split(".<locals>", 1)[0].rsplit(".", 1)[0],
-            None,
-        )
-        if isinstance(c, type):
+        # functions are hashable and stable, cache the expensive module lookup
+        c = _get_class_that_defined_function(meth)
+        if c is not None:
             return c
     return getattr(meth, "__objclass__", None)  # handle special descriptor objects
@@ -14,6 +14,8 @@ from wake.printers import Printer, printer
 
 
 class AbiPrinter(Printer):
+    mutates_graph = False
+
     _names: Set[str]
     _out: Optional[Path]
     _skip_empty: bool
@@ -12,6 +12,8 @@ from wake.printers import Printer, printer
 
 # C3 linearization printer
 class C3LinearizationPrinter(Printer):
+    mutates_graph = False
+
     _interfaces: bool
     _verbose: bool
 
@@ -14,6 +14,8 @@ from wake.printers import Printer, printer
 
 
 class ControlFlowGraphPrinter(Printer):
+    mutates_graph = False
+
     _names: Set[str]
     _out: Path
     _direction: str
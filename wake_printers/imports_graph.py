@@ -14,6 +14,8 @@ from wake.printers import Printer, printer
 
 
 class ImportsGraphPrinter(Printer):
+    mutates_graph = False
+
     _out: Path
     _graph_direction: str
     _edge_direction: str
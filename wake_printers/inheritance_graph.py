@@ -15,6 +15,8 @@ from wake.printers import Printer, printer
 
 
 class InheritanceGraphPrinter(Printer):
+    mutates_graph = False
+
     _names: Set[str]
     _out: Path
     _direction: str
@@ -14,6 +14,8 @@ from wake.printers import Printer, printer
 
 
 class InheritanceTreePrinter(Printer):
+    mutates_graph = False
+
     _names: Set[str]
 
     def print(self) -> None:
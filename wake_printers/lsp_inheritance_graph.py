@@ -17,6 +17,7 @@ if TYPE_CHECKING:
 
 class LspInheritanceGraphPrinter(Printer):
     execution_mode = "lsp"
+    mutates_graph = False
 
     _direction: Literal["LR", "RL", "TB", "BT"]
     _urls: bool
@@ -12,6 +12,7 @@ from wake.printers import Printer, printer
 
 class LspOpenzeppelinDocsPrinter(Printer):
     execution_mode = "lsp"
+    mutates_graph = False
 
     def __init__(self):
         from wake.utils.openzeppelin import get_contracts_package_version
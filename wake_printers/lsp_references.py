@@ -14,6 +14,7 @@ from wake.printers import Printer, printer
 
 class LspReferencesPrinter(Printer):
     execution_mode = "lsp"
+    mutates_graph = False
 
     _include_declarations: bool
     _local_variables: bool
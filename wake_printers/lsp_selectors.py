@@ -12,6 +12,7 @@ from wake.printers import Printer, printer
 
 class LspSelectorsPrinter(Printer):
     execution_mode = "lsp"
+    mutates_graph = False
 
     _functions: bool
     _errors: bool
@@ -97,6 +97,7 @@ yul_definitions = {
 
 class LspYulDefinitionsPrinter(Printer):
     execution_mode = "lsp"
+    mutates_graph = False
 
     def print(self) -> None:
         pass
@@ -13,6 +13,8 @@ from wake.printers import Printer, printer
 
 
 class ModifiersPrinter(Printer):
+    mutates_graph = False
+
     _names: Set[str]
     _canonical_names: bool
     _snippets: bool
@@ -17,6 +17,8 @@ if TYPE_CHECKING:
 
 
 class StateChangesPrinter(Printer):
+    mutates_graph = False
+
     _names: Set[str]
     _links: bool
 
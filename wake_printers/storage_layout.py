@@ -13,6 +13,8 @@ from wake.printers import Printer, printer
 
 
 class StorageLayoutPrinter(Printer):
+    mutates_graph = False
+
     _names: Set[str]
     _split_slots: bool
     _table_style: str
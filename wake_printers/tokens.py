@@ -12,6 +12,8 @@ from wake.printers import Printer, printer
 
 
 class TokensPrinter(Printer):
+    mutates_graph = False
+
     erc20_functions = {
         b"\x18\x16\x0d\xdd",  # totalSupply()
         b"\x70\xa0\x82\x31",  # balanceOf(address)